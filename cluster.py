@@ -5,39 +5,71 @@ class Cluster:
         #   1.0 = Standard Reference
         #   5.0 = 5x Faster (Task takes 1/5th the time)
         #   0.5 = Half speed (Task takes 2x the time)
+        # "Slots" / "Memory" (GB) are the capacity shared by concurrently running tasks:
+        #   CPU hosts expose cores, A100s are split into 7 MIG slices, T4s run one task
         
         self.nodes = {
             # Fast CPUs
-            'cpu_fast_1': {'type': 'cpu', 'power': 200, 'speed': 2.0},
-            'cpu_fast_2': {'type': 'cpu', 'power': 200, 'speed': 2.0},
-            'cpu_fast_3': {'type': 'cpu', 'power': 200, 'speed': 2.0},
-            'cpu_fast_4': {'type': 'cpu', 'power': 200, 'speed': 2.0},
+            'cpu_fast_1': {'type': 'cpu', 'power': 200, 'speed': 2.0, 'group': 'cpu_fast', 'slots': 32, 'memory': 256},
+            'cpu_fast_2': {'type': 'cpu', 'power': 200, 'speed': 2.0, 'group': 'cpu_fast', 'slots': 32, 'memory': 256},
+            'cpu_fast_3': {'type': 'cpu', 'power': 200, 'speed': 2.0, 'group': 'cpu_fast', 'slots': 32, 'memory': 256},
+            'cpu_fast_4': {'type': 'cpu', 'power': 200, 'speed': 2.0, 'group': 'cpu_fast', 'slots': 32, 'memory': 256},
 
             # Slow CPUs
-            'cpu_slow_1': {'type': 'cpu', 'power': 60, 'speed': 0.8},
-            'cpu_slow_2': {'type': 'cpu', 'power': 60, 'speed': 0.8},
-            'cpu_slow_3': {'type': 'cpu', 'power': 60, 'speed': 0.8},
-            'cpu_slow_4': {'type': 'cpu', 'power': 60, 'speed': 0.8},
-            'cpu_slow_5': {'type': 'cpu', 'power': 60, 'speed': 0.8},
-            'cpu_slow_6': {'type': 'cpu', 'power': 60, 'speed': 0.8},
-            'cpu_slow_7': {'type': 'cpu', 'power': 60, 'speed': 0.8},
-            'cpu_slow_8': {'type': 'cpu', 'power': 60, 'speed': 0.8},
-            'cpu_slow_9': {'type': 'cpu', 'power': 60, 'speed': 0.8},
-            'cpu_slow_10': {'type': 'cpu', 'power': 60, 'speed': 0.8},
-            'cpu_slow_11': {'type': 'cpu', 'power': 60, 'speed': 0.8},
-            'cpu_slow_12': {'type': 'cpu', 'power': 60, 'speed': 0.8},
+            'cpu_slow_1': {'type': 'cpu', 'power': 60, 'speed': 0.8, 'group': 'cpu_slow', 'slots': 16, 'memory': 64},
+            'cpu_slow_2': {'type': 'cpu', 'power': 60, 'speed': 0.8, 'group': 'cpu_slow', 'slots': 16, 'memory': 64},
+            'cpu_slow_3': {'type': 'cpu', 'power': 60, 'speed': 0.8, 'group': 'cpu_slow', 'slots': 16, 'memory': 64},
+            'cpu_slow_4': {'type': 'cpu', 'power': 60, 'speed': 0.8, 'group': 'cpu_slow', 'slots': 16, 'memory': 64},
+            'cpu_slow_5': {'type': 'cpu', 'power': 60, 'speed': 0.8, 'group': 'cpu_slow', 'slots': 16, 'memory': 64},
+            'cpu_slow_6': {'type': 'cpu', 'power': 60, 'speed': 0.8, 'group': 'cpu_slow', 'slots': 16, 'memory': 64},
+            'cpu_slow_7': {'type': 'cpu', 'power': 60, 'speed': 0.8, 'group': 'cpu_slow', 'slots': 16, 'memory': 64},
+            'cpu_slow_8': {'type': 'cpu', 'power': 60, 'speed': 0.8, 'group': 'cpu_slow', 'slots': 16, 'memory': 64},
+            'cpu_slow_9': {'type': 'cpu', 'power': 60, 'speed': 0.8, 'group': 'cpu_slow', 'slots': 16, 'memory': 64},
+            'cpu_slow_10': {'type': 'cpu', 'power': 60, 'speed': 0.8, 'group': 'cpu_slow', 'slots': 16, 'memory': 64},
+            'cpu_slow_11': {'type': 'cpu', 'power': 60, 'speed': 0.8, 'group': 'cpu_slow', 'slots': 16, 'memory': 64},
+            'cpu_slow_12': {'type': 'cpu', 'power': 60, 'speed': 0.8, 'group': 'cpu_slow', 'slots': 16, 'memory': 64},
 
             # High end GPUs like a100
-            'gpu_a100_1': {'type': 'gpu', 'power': 400, 'speed': 6.0},
-            'gpu_a100_2': {'type': 'gpu', 'power': 400, 'speed': 6.0},
+            'gpu_a100_1': {'type': 'gpu', 'power': 400, 'speed': 6.0, 'group': 'gpu_a100', 'slots': 7, 'memory': 80},
+            'gpu_a100_2': {'type': 'gpu', 'power': 400, 'speed': 6.0, 'group': 'gpu_a100', 'slots': 7, 'memory': 80},
 
             # Efficiency GPUs like T4
-            'gpu_t4_1': {'type': 'gpu', 'power': 70, 'speed': 1.5},
-            'gpu_t4_2': {'type': 'gpu', 'power': 70, 'speed': 1.5},
-            'gpu_t4_3': {'type': 'gpu', 'power': 70, 'speed': 1.5},
-            'gpu_t4_4': {'type': 'gpu', 'power': 70, 'speed': 1.5},
-            'gpu_t4_5': {'type': 'gpu', 'power': 70, 'speed': 1.5},
-            'gpu_t4_6': {'type': 'gpu', 'power': 70, 'speed': 1.5},
+            'gpu_t4_1': {'type': 'gpu', 'power': 70, 'speed': 1.5, 'group': 'gpu_t4', 'slots': 1, 'memory': 16},
+            'gpu_t4_2': {'type': 'gpu', 'power': 70, 'speed': 1.5, 'group': 'gpu_t4', 'slots': 1, 'memory': 16},
+            'gpu_t4_3': {'type': 'gpu', 'power': 70, 'speed': 1.5, 'group': 'gpu_t4', 'slots': 1, 'memory': 16},
+            'gpu_t4_4': {'type': 'gpu', 'power': 70, 'speed': 1.5, 'group': 'gpu_t4', 'slots': 1, 'memory': 16},
+            'gpu_t4_5': {'type': 'gpu', 'power': 70, 'speed': 1.5, 'group': 'gpu_t4', 'slots': 1, 'memory': 16},
+            'gpu_t4_6': {'type': 'gpu', 'power': 70, 'speed': 1.5, 'group': 'gpu_t4', 'slots': 1, 'memory': 16},
+        }
+
+        # Network Topology
+        # Nodes sharing a 'group' sit behind the same switch, so links are
+        # described per pair of groups instead of a dense node x node matrix.
+        #   bandwidth     = MB/s
+        #   latency       = seconds per transfer
+        #   energy_per_mb = Joules spent moving 1 MB
+        # Data never moves when parent and child run on the same node.
+
+        # Same group (same rack / switch)
+        self.intra_group_link = {'bandwidth': 1250, 'latency': 0.05, 'energy_per_mb': 0.5}
+
+        # Explicit group-to-group links (symmetric)
+        self.links = {
+            frozenset(('cpu_fast', 'cpu_slow')): {'bandwidth': 1250, 'latency': 0.1, 'energy_per_mb': 0.8},
+            frozenset(('gpu_a100', 'gpu_t4')): {'bandwidth': 600, 'latency': 0.2, 'energy_per_mb': 1.0},
+        }
+
+        # Everything else (CPU <-> GPU hosts) crosses the slow core network
+        self.default_link = {'bandwidth': 100, 'latency': 1.0, 'energy_per_mb': 3.0}
+
+        # Runtime Variability per node class (topology group)
+        # A class-wide runtime multiplier drawn once per scenario, on top of each
+        # task's own noise (see Task.runtime_dist). Missing groups are deterministic.
+        self.group_runtime_dists = {
+            'cpu_fast': {'type': 'lognormal', 'sigma': 0.05},
+            'cpu_slow': {'type': 'lognormal', 'sigma': 0.2},   # old, shared, throttled hosts
+            'gpu_a100': {'type': 'lognormal', 'sigma': 0.05},
+            'gpu_t4':   {'type': 'lognormal', 'sigma': 0.15},
         }
 
     def get_all_nodes(self):
@@ -50,6 +82,33 @@ class Cluster:
     def get_power_consumption(self, node_name):
         return self.nodes[node_name]['power']
         
+    def get_node_capacity(self, node_name):
+        """Returns (slots, memory_gb) a node can share between concurrent tasks."""
+        node = self.nodes[node_name]
+        return node.get('slots', 1), node.get('memory', float('inf'))
+
     def get_node_speed(self, node_name):
         """Returns the speed multiplier of the node."""
-        return self.nodes.get(node_name, {}).get('speed', 1.0)
\ No newline at end of file
+        return self.nodes.get(node_name, {}).get('speed', 1.0)
+
+    def get_node_group(self, node_name):
+        """Returns the topology group (rack / switch) the node belongs to."""
+        return self.nodes[node_name].get('group', node_name)
+
+    def get_all_groups(self):
+        groups = []
+        for node in self.nodes:
+            group = self.get_node_group(node)
+            if group not in groups:
+                groups.append(group)
+        return groups
+
+    def get_group_link(self, group_a, group_b):
+        """Returns the link properties between two topology groups."""
+        if group_a == group_b:
+            return self.intra_group_link
+        return self.links.get(frozenset((group_a, group_b)), self.default_link)
+
+    def get_group_runtime_dist(self, group):
+        """Runtime multiplier distribution of a node class, or None if deterministic."""
+        return self.group_runtime_dists.get(group)
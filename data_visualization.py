@@ -1,32 +1,74 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
+import csv
 import os
+from metrics import compute_metrics
+
+# Columns parsed back into numbers when results are read from CSV
+NUMERIC_COLUMNS = ['Start Time (s)', 'Finish Time (s)', 'Wait Time (s)', 'Runtime (s)', 'Slots', 'Memory (GB)',
+                   'Walltime (s)', 'Transfer Delay (s)', 'Transfer Energy (J)', 'Energy (J)']
 
 def ensure_dir(directory):
     if not os.path.exists(directory):
         os.makedirs(directory)
 
-def plot_gantt(ax, df, title):
-    """Helper to draw a Gantt chart on a specific axes."""
+def load_results(filename):
+    """Reads a scheduler results CSV back into the row dicts evaluate_schedule() returns."""
+    with open(filename, newline='') as f:
+        rows = list(csv.DictReader(f))
+    for row in rows:
+        for column in NUMERIC_COLUMNS:
+            if column in row:
+                row[column] = float(row[column])
+    return rows
+
+def stack_lanes(rows):
+    """
+    Sub-row (lane) of every task on its node, so tasks that run at the same
+    time on a multi-slot node are drawn above each other instead of on top
+    of each other. Each task takes the lowest lane that is free again when
+    it starts. Returns ({job_id: lane}, {node: number of lanes}).
+    """
+    lanes = {}
+    lane_ends = {}
+    for row in sorted(rows, key=lambda row: row['Start Time (s)']):
+        start = row['Start Time (s)']
+        ends = lane_ends.setdefault(row['Assigned Node'], [])
+        lane = next((k for k, end in enumerate(ends) if end <= start), len(ends))
+        if lane == len(ends):
+            ends.append(0.0)
+        ends[lane] = start + row['Runtime (s)']
+        lanes[row['Job ID']] = lane
+    return lanes, {node: len(ends) for node, ends in lane_ends.items()}
+
+def plot_gantt(ax, rows, title):
+    """Helper to draw a Gantt chart on a specific axes (one band per node, one lane per concurrent task)."""
+    import matplotlib.patches as mpatches
+
     colors = {'CPU': '#1f77b4', 'GPU': '#ff7f0e'}
-    
-    nodes = sorted(df['Assigned Node'].unique())
-    yticks = range(len(nodes))
-    node_map = {node: i for i, node in enumerate(nodes)}
-    
-    for _, row in df.iterrows():
-        node = row['Assigned Node']
+
+    lanes, lane_counts = stack_lanes(rows)
+    nodes = sorted(lane_counts)
+    node_base = {}
+    yticks = []
+    base = 0
+    for node in nodes:
+        if base:
+            ax.axhline(base - 0.5, color='lightgray', linewidth=0.8)
+        node_base[node] = base
+        yticks.append(base + (lane_counts[node] - 1) / 2)
+        base += lane_counts[node]
+
+    for row in rows:
+        y = node_base[row['Assigned Node']] + lanes[row['Job ID']]
         start = row['Start Time (s)']
         duration = row['Runtime (s)']
         r_type = row['Assigned Resource']
-        
-        ax.broken_barh([(start, duration)], (node_map[node] - 0.4, 0.8), 
+
+        ax.broken_barh([(start, duration)], (y - 0.4, 0.8),
                        facecolors=colors.get(r_type, 'gray'), edgecolor='black')
-        
+
         # Only label if the bar is wide enough to be readable
         if duration > 5:
-            ax.text(start + duration/2, node_map[node], row['Job ID'], 
+            ax.text(start + duration/2, y, row['Job ID'],
                     ha='center', va='center', color='white', fontsize=6)
 
     ax.set_yticks(yticks)
@@ -34,66 +76,52 @@ def plot_gantt(ax, df, title):
     ax.set_xlabel("Time (seconds)")
     ax.set_title(title)
     ax.grid(True, axis='x', linestyle='--', alpha=0.5)
-    
+
     patches = [mpatches.Patch(color=c, label=l) for l, c in colors.items()]
     ax.legend(handles=patches, loc='upper right')
 
-def compare_results():
-    output_dir = "visualizations"
-    ensure_dir(output_dir)
+def plot_comparison(results, output_dir="visualizations"):
+    """
+    Generates the comparison plots for any number of schedules.
+    results: {label: csv_rows}, in display order (the first one is the baseline).
+    """
+    # Plotting libraries are only imported once plots are actually requested
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
 
-    try:
-        fcfs = pd.read_csv("fcfs_results.csv")
-        genetic = pd.read_csv("genetic_results.csv")
-    except FileNotFoundError:
-        print("Error: Could not find input files.")
-        print("Please run:")
-        print("  python fcfs.py --output fcfs_results.csv")
-        print("  python scheduler.py --output genetic_results.csv")
-        return
+    ensure_dir(output_dir)
 
-    # --- Calculate Metrics ---
-    makespan_fcfs = fcfs['Finish Time (s)'].max()
-    makespan_gen = genetic['Finish Time (s)'].max()
-    
-    energy_fcfs = fcfs['Energy (J)'].sum()
-    energy_gen = genetic['Energy (J)'].sum()
-    
-    fb_fcfs = fcfs[fcfs['Fallback Occurred'] == 'YES'].shape[0]
-    fb_gen = genetic[genetic['Fallback Occurred'] == 'YES'].shape[0]
-    
-    wait_fcfs = fcfs['Wait Time (s)'].mean()
-    wait_gen = genetic['Wait Time (s)'].mean()
-    
-    wall_fcfs = fcfs['Walltime (s)'].mean()
-    wall_gen = genetic['Walltime (s)'].mean()
+    labels = list(results.keys())
+    metrics = {label: compute_metrics(rows) for label, rows in results.items()}
 
     # --- Define Plot List ---
-    # Format: (Title, [Values], Color, Filename, Y-Label)
+    # Format: (Title, Metric, Color, Filename, Y-Label)
     plots_to_generate = [
-        ('Makespan Comparison', [makespan_fcfs, makespan_gen], 'green', 'makespan_comparison.png', 'Total Duration (s)'),
-        ('Total Energy Comparison', [energy_fcfs, energy_gen], 'blue', 'energy_comparison.png', 'Energy (J)'),
-        ('Fallback Count', [fb_fcfs, fb_gen], 'orange', 'fallback_comparison.png', 'Count'),
-        ('Average Wait Time', [wait_fcfs, wait_gen], 'purple', 'wait_time_comparison.png', 'Time (s)'),
-        ('Average Wall Time', [wall_fcfs, wall_gen], 'teal', 'wall_time_comparison.png', 'Time (s)')
+        ('Makespan Comparison', 'makespan', 'green', 'makespan_comparison.png', 'Total Duration (s)'),
+        ('Total Energy Comparison', 'energy', 'blue', 'energy_comparison.png', 'Energy (J)'),
+        ('Fallback Count', 'fallbacks', 'orange', 'fallback_comparison.png', 'Count'),
+        ('Average Wait Time', 'avg_wait', 'purple', 'wait_time_comparison.png', 'Time (s)'),
+        ('Average Wall Time', 'avg_wall', 'teal', 'wall_time_comparison.png', 'Time (s)')
     ]
 
     # --- Generate Individual Plots ---
-    for title, values, color, filename, ylabel in plots_to_generate:
+    for title, metric, color, filename, ylabel in plots_to_generate:
         plt.figure(figsize=(8, 6))
-        bars = plt.bar(['FCFS', 'Genetic'], values, color=['gray', color])
-        
+        values = [metrics[label][metric] for label in labels]
+        bars = plt.bar(labels, values, color=['gray'] + [color] * (len(labels) - 1))
+
         plt.title(title, fontsize=14)
         plt.ylabel(ylabel, fontsize=12)
         plt.grid(axis='y', linestyle='--', alpha=0.5)
-        
+
         # Add text labels on bars
         for bar in bars:
             height = bar.get_height()
             plt.text(bar.get_x() + bar.get_width()/2., height,
                      f'{height:.1f}',
                      ha='center', va='bottom', fontweight='bold')
-        
+
         save_path = os.path.join(output_dir, filename)
         plt.savefig(save_path)
         print(f"Saved {title} to: {save_path}")
@@ -101,16 +129,33 @@ def compare_results():
 
     # --- Generate Gantt Comparison (Stacked) ---
     # We keep these together because aligning the X-axis is critical for comparison
-    fig_gantt, (ax1, ax2) = plt.subplots(2, 1, figsize=(15, 10), sharex=True)
-    
-    plot_gantt(ax1, fcfs, f"FCFS Schedule (Makespan: {makespan_fcfs:.1f}s)")
-    plot_gantt(ax2, genetic, f"Genetic Schedule (Makespan: {makespan_gen:.1f}s)")
-    
+    # Busy multi-slot nodes take one lane per concurrent task, so grow the charts with the lanes
+    lanes = max(sum(stack_lanes(rows)[1].values()) for rows in results.values())
+    fig_gantt, axes = plt.subplots(len(labels), 1, figsize=(15, max(5, 0.2 * lanes) * len(labels)),
+                                   sharex=True, squeeze=False)
+
+    for ax, label in zip(axes[:, 0], labels):
+        plot_gantt(ax, results[label], f"{label} Schedule (Makespan: {metrics[label]['makespan']:.1f}s)")
+
     plt.tight_layout()
     gantt_path = os.path.join(output_dir, "gantt_comparison.png")
     plt.savefig(gantt_path)
     print(f"Saved Gantt comparison to: {gantt_path}")
     plt.close(fig_gantt)
 
+def compare_results():
+    try:
+        fcfs = load_results("fcfs_results.csv")
+        genetic = load_results("genetic_results.csv")
+    except FileNotFoundError:
+        print("Error: Could not find input files.")
+        print("Please run:")
+        print("  python fcfs.py --output fcfs_results.csv")
+        print("  python genetic_scheduler.py --output genetic_results.csv")
+        print("or run everything in one go with: python -m pipeline --plots")
+        return
+
+    plot_comparison({'FCFS': fcfs, 'Genetic': genetic})
+
 if __name__ == "__main__":
-    compare_results()
\ No newline at end of file
+    compare_results()
@@ -0,0 +1,301 @@
+import argparse
+import contextlib
+import csv
+import io
+import time
+from concurrent.futures import ProcessPoolExecutor
+from cluster import Cluster
+from jobs import Workflow
+from genetic_scheduler import GeneticScheduler
+from metrics import compute_metrics
+from simulation import SimulationModel, BoundaryState
+
+def sub_workflow(tasks):
+    """Wraps a slice of tasks in a Workflow (dependencies outside it stay as they are)."""
+    workflow = Workflow()
+    workflow.tasks = list(tasks)
+    return workflow
+
+def schedule_chunk(cluster, tasks, boundary, population_size, generations, mode, seed, allowed_nodes=None,
+                   initial_schedules=None):
+    """Runs the GA on one chunk against the cluster state it inherits. Worker entry point."""
+    # Dozens of chunk GAs would flood the console with generation logs
+    with contextlib.redirect_stdout(io.StringIO()):
+        ga = GeneticScheduler(cluster, sub_workflow(tasks), population_size=population_size,
+                              generations=generations, mode=mode, seed=seed, boundary=boundary,
+                              allowed_nodes=allowed_nodes, initial_schedules=initial_schedules)
+        return ga.run()
+
+class HierarchicalScheduler:
+    """
+    Schedules very large workflows by cutting the topological order into chunks
+    of `chunk_size` tasks and running a small GA per chunk. Each chunk starts
+    from the node free times and parent placements left by the chunks before
+    it, so cost grows linearly with the number of chunks instead of the GA
+    having to search all genes at once.
+
+    With workers > 1 a chunk is further split into groups of tasks that share
+    no dependencies, and each group gets its own share of every node class, so
+    the groups can be optimized in parallel and merged without conflicts. A
+    share only sees part of the cluster, so the merged chunk is then refined
+    by a shorter GA over the whole cluster, seeded with the merged schedule,
+    before its state is carried on. A final polishing pass revisits every
+    chunk boundary and moves tasks that straddle it next to their parents /
+    children when that helps.
+    """
+    def __init__(self, cluster, workflow, chunk_size=500, population_size=50, generations=30,
+                 mode='balanced', seed=None, workers=1, polish=True):
+        self.cluster = cluster
+        self.workflow = workflow
+        self.chunk_size = chunk_size
+        self.population_size = population_size
+        self.generations = generations
+        self.mode = mode
+        self.seed = seed
+        self.workers = workers
+        self.polish = polish
+        self.model = SimulationModel(cluster, workflow)
+
+    def make_chunks(self):
+        """Contiguous slices of the topological order; parents always land in the same or an earlier chunk."""
+        tasks = self.model.tasks
+        return [tasks[i:i + self.chunk_size] for i in range(0, len(tasks), self.chunk_size)]
+
+    def split_independent(self, chunk, parts):
+        """Groups a chunk's tasks into at most `parts` sets with no dependencies between them."""
+        names = {task.name for task in chunk}
+        component = {task.name: task.name for task in chunk}
+
+        def find(name):
+            while component[name] != name:
+                component[name] = component[component[name]]
+                name = component[name]
+            return name
+
+        for task in chunk:
+            for dep in task.dependencies:
+                if dep in names:
+                    component[find(task.name)] = find(dep)
+
+        members = {}
+        for task in chunk:
+            members.setdefault(find(task.name), []).append(task)
+
+        # Largest components first onto the lightest group
+        groups = [[] for _ in range(min(parts, len(members)))]
+        for tasks in sorted(members.values(), key=len, reverse=True):
+            min(groups, key=len).extend(tasks)
+
+        # Keep topological order inside each group
+        position = self.model.task_index
+        return [sorted(group, key=lambda t: position[t.name]) for group in groups if group]
+
+    def partition_nodes(self, parts):
+        """
+        Deals the nodes of every topology group round-robin into disjoint shares.
+        Every share gets at least one node of every group (so any task that fits
+        the cluster fits its share), which caps the number of shares at the
+        size of the smallest group.
+        """
+        by_group = {}
+        for node in self.model.node_names:
+            by_group.setdefault(self.cluster.get_node_group(node), []).append(node)
+
+        parts = max(1, min([parts] + [len(nodes) for nodes in by_group.values()]))
+        shares = [[] for _ in range(parts)]
+        for nodes in by_group.values():
+            for k, node in enumerate(nodes):
+                shares[k % parts].append(node)
+        return shares
+
+    def chunk_boundary(self, tasks, state):
+        """The slice of the carried state a set of tasks actually needs."""
+        names = {task.name for task in tasks}
+        external = {dep for task in tasks for dep in task.dependencies if dep not in names}
+        return BoundaryState(dict(state.node_states),
+                             {dep: state.task_nodes[dep] for dep in external},
+                             {dep: state.task_finish[dep] for dep in external})
+
+    def advance(self, tasks, schedule, state):
+        """Simulates a chunk with its final assignment and folds it into the carried state."""
+        model = SimulationModel(self.cluster, sub_workflow(tasks), self.chunk_boundary(tasks, state))
+        assignment = model.encode(schedule)
+        return model.boundary_after(assignment, model.simulate(assignment), state)
+
+    def run(self):
+        chunks = self.make_chunks()
+        print(f"Hierarchical scheduling: {len(self.model.tasks)} tasks in {len(chunks)} chunks "
+              f"of <= {self.chunk_size} (workers: {self.workers})")
+
+        schedule = {}
+        state = BoundaryState()
+        pool = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        try:
+            for k, chunk in enumerate(chunks):
+                parts = len(self.partition_nodes(self.workers)) if pool else 1
+                groups = self.split_independent(chunk, parts) if parts > 1 else [chunk]
+                shares = self.partition_nodes(len(groups)) if len(groups) > 1 else [None]
+                seed = None if self.seed is None else self.seed + k
+                jobs = [(self.cluster, group, self.chunk_boundary(group, state), self.population_size,
+                         self.generations, self.mode, seed, share) for group, share in zip(groups, shares)]
+
+                if len(jobs) > 1:
+                    merged = {}
+                    for group_schedule in pool.map(schedule_chunk, *zip(*jobs)):
+                        merged.update(group_schedule)
+                    # Each group only saw its own share; let the chunk use the whole cluster
+                    chunk_schedule = schedule_chunk(self.cluster, chunk, self.chunk_boundary(chunk, state),
+                                                    self.population_size, self.refine_generations(len(jobs)),
+                                                    self.mode, seed, initial_schedules=[merged])
+                else:
+                    chunk_schedule = schedule_chunk(*jobs[0])
+
+                schedule.update(chunk_schedule)
+                state = self.advance(chunk, schedule, state)
+
+                if k % 10 == 0:
+                    chunk_finish = max(state.task_finish[task.name] for task in chunk)
+                    print(f"Chunk {k:<4} | Chunk finish: {chunk_finish:.2f}")
+        finally:
+            if pool:
+                pool.shutdown()
+
+        if self.polish and len(chunks) > 1:
+            moved = self.polish_boundaries(chunks, schedule)
+            print(f"Boundary polishing moved {moved} tasks")
+
+        return schedule
+
+    def refine_generations(self, parts):
+        """Generations of the whole-cluster pass after `parts` groups were optimized in parallel."""
+        # The merged schedule is already close; a few whole-cluster generations recover what the split lost
+        return max(2, self.generations // (2 * parts))
+
+    def polish_boundaries(self, chunks, schedule):
+        """
+        Walks the chunk boundaries in order. For each pair of neighbouring chunks,
+        tasks with a dependency across the boundary are tried on the nodes of their
+        cross-boundary neighbours (plus their current node), scoring the pair with
+        the GA fitness from the state before the first chunk. A move can still
+        delay the chunks after the pair, so the moves that improved the pair are
+        only kept if the whole workflow's fitness improves too.
+        """
+        children = {}
+        for task in self.model.tasks:
+            for dep in task.dependencies:
+                children.setdefault(dep, []).append(task.name)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            whole = GeneticScheduler(self.cluster, self.workflow, population_size=1, generations=0, mode=self.mode)
+        whole_score = whole.calculate_fitness(schedule)[0]
+
+        moved = 0
+        state = BoundaryState()
+        for k in range(1, len(chunks)):
+            left, right = chunks[k - 1], chunks[k]
+            left_names = {task.name for task in left}
+            right_names = {task.name for task in right}
+
+            seam = [task for task in right if any(dep in left_names for dep in task.dependencies)]
+            seam += [task for task in left if any(child in right_names for child in children.get(task.name, []))]
+
+            if seam:
+                pair = left + right
+                with contextlib.redirect_stdout(io.StringIO()):
+                    evaluator = GeneticScheduler(self.cluster, sub_workflow(pair), population_size=1,
+                                                 generations=0, mode=self.mode,
+                                                 boundary=self.chunk_boundary(pair, state))
+                current = {task.name: schedule[task.name] for task in pair}
+                best_score = evaluator.calculate_fitness(current)[0]
+                originals = {}
+
+                for task in seam:
+                    i = evaluator.model.task_index[task.name]
+                    valid = {evaluator.model.node_names[n] for n in evaluator.model.candidates[i]}
+                    neighbours = [dep for dep in task.dependencies if dep in schedule]
+                    neighbours += children.get(task.name, [])
+                    options = {schedule[name] for name in neighbours if name in schedule} & valid
+
+                    original = current[task.name]
+                    best_node = original
+                    for node in options - {original}:
+                        current[task.name] = node
+                        score = evaluator.calculate_fitness(current)[0]
+                        if score < best_score:
+                            best_score = score
+                            best_node = node
+                    current[task.name] = best_node
+                    if best_node != original:
+                        originals[task.name] = original
+                        schedule[task.name] = best_node
+
+                if originals:
+                    score = whole.calculate_fitness(schedule)[0]
+                    if score < whole_score:
+                        whole_score = score
+                        moved += len(originals)
+                    else:
+                        schedule.update(originals)
+
+            state = self.advance(left, schedule, state)
+        return moved
+
+    def evaluate_schedule(self, schedule):
+        """Simulates the full schedule and returns (csv_rows, start_times, finish_times, total_energy)."""
+        assignment = self.model.encode(schedule)
+        result = self.model.simulate(assignment)
+        csv_rows = self.model.build_csv_rows(assignment, result)
+
+        task_start_time = dict(zip(self.model.task_names, result.start))
+        task_finish_time = dict(zip(self.model.task_names, result.finish))
+        return csv_rows, task_start_time, task_finish_time, result.total_energy
+
+    def save_results_to_csv(self, schedule, filename):
+        csv_rows, _, _, _ = self.evaluate_schedule(schedule)
+
+        if csv_rows:
+            fieldnames = csv_rows[0].keys()
+            with open(filename, mode='w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                writer.writeheader()
+                writer.writerows(csv_rows)
+            print(f"\nDetailed schedule written to: {filename}")
+
+        metrics = compute_metrics(csv_rows)
+        print("\n--- Simulation Results (Hierarchical GA) ---")
+        print(f"Tasks: {len(csv_rows)}")
+        print(f"Fallbacks: {metrics['fallbacks']} jobs ran on slower resources")
+        print(f"1. Total Workflow Duration: {metrics['makespan']:.2f} s")
+        print(f"2. Total Energy Consumed:   {metrics['energy']:.2f} J")
+        print(f"3. Avg Wait Time per Job:   {metrics['avg_wait']:.2f} s")
+        print(f"4. Avg Wall Time per Job:   {metrics['avg_wall']:.2f} s")
+        print(f"5. Avg Energy per Job:      {metrics['energy'] / len(csv_rows):.2f} J")
+        print("--------------------------------------------")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the GA chunk-by-chunk on very large workflows")
+    parser.add_argument("--tasks", type=int, default=10000, help="Number of tasks")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--output", type=str, default="hierarchical_results.csv", help="Output CSV file")
+    parser.add_argument("--chunk", type=int, default=500, help="Tasks per chunk")
+    parser.add_argument("--gens", type=int, default=30, help="Generations per chunk")
+    parser.add_argument("--pop", type=int, default=50, help="Population size per chunk")
+    parser.add_argument("--mode", type=str, default="balanced", choices=['speed', 'energy', 'balanced'],
+                        help="Optimization Mode: speed, energy, or balanced")
+    parser.add_argument("--workers", type=int, default=1, help="Processes for independent task groups")
+    parser.add_argument("--no-polish", action="store_true", help="Skip the boundary polishing pass")
+
+    args = parser.parse_args()
+
+    c = Cluster()
+    w = Workflow()
+    w.generate_random_workflow(num_tasks=args.tasks, seed=args.seed)
+
+    start = time.perf_counter()
+    scheduler = HierarchicalScheduler(c, w, chunk_size=args.chunk, population_size=args.pop,
+                                      generations=args.gens, mode=args.mode, seed=args.seed,
+                                      workers=args.workers, polish=not args.no_polish)
+    best_schedule = scheduler.run()
+    print(f"Scheduling took {time.perf_counter() - start:.1f} s")
+
+    scheduler.save_results_to_csv(best_schedule, args.output)
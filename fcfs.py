@@ -2,134 +2,69 @@ import argparse
 import csv
 from cluster import Cluster
 from jobs import Workflow
+from simulation import SimulationModel, topological_sort
 
 class FCFSScheduler:
     def __init__(self, cluster, workflow):
         self.cluster = cluster
         self.workflow = workflow
+        self.model = SimulationModel(cluster, workflow)
 
     def run(self):
         print(f"Scheduling {len(self.workflow.tasks)} tasks...")
         
-        node_free_time = {node: 0 for node in self.cluster.get_all_nodes()}
+        model = self.model
+        node_states = model.new_node_states()
         
         task_finish_time = {}
         task_start_time = {}
         
-        schedule = {} # Store the final assignment {task_id: node_id}
+        assignment = [None] * len(model.tasks)
+        finish = [0.0] * len(model.tasks)
         
-        sorted_tasks = self.topological_sort()
-        
-        for task in sorted_tasks:
-            if not task.dependencies:
-                deps_ready_time = 0
-            else:
-                deps_ready_time = max(task_finish_time[dep] for dep in task.dependencies)
-            
+        for i, task in enumerate(model.tasks):
             best_node = None
             earliest_start = float('inf')
             earliest_finish = float('inf')
             
-            candidate_nodes = []
-            for r_type in task.duration_profiles.keys():
-                 nodes = [n for n in self.cluster.get_all_nodes() if self.cluster.get_node_type(n) == r_type]
-                 candidate_nodes.extend(nodes)
-            
-            if not candidate_nodes:
-                raise Exception(f"No valid nodes for task {task.name}")
-
-            for node in candidate_nodes:
-                node_ready = node_free_time[node]
-                start_time = max(node_ready, deps_ready_time)
-                
-                r_type = self.cluster.get_node_type(node)
-                base_duration = task.duration_profiles[r_type]
-                speed = self.cluster.get_node_speed(node)
-                duration = base_duration / speed
-                
-                finish_time = start_time + duration
+            for node in model.candidates[i]:
+                # Inputs produced on other nodes have to be shipped here first
+                deps_ready_time, _ = model.data_ready(i, node, assignment, finish)
+                slots, memory = model.demand[i][node]
+                start_time = node_states[node].earliest_start(deps_ready_time, model.runtime[i][node], slots, memory)
+                finish_time = start_time + model.runtime[i][node]
                 
                 if finish_time < earliest_finish:
                     earliest_finish = finish_time
                     earliest_start = start_time
                     best_node = node
             
-            schedule[task.name] = best_node
-            node_free_time[best_node] = earliest_finish
+            assignment[i] = best_node
+            finish[i] = earliest_finish
+            slots, memory = model.demand[i][best_node]
+            node_states[best_node].place(earliest_start, earliest_finish, slots, memory)
             task_finish_time[task.name] = earliest_finish
             task_start_time[task.name] = earliest_start
 
+        schedule = model.decode(assignment) # Final assignment {task_id: node_id}
         return schedule, task_finish_time, task_start_time
 
     def topological_sort(self):
-        sorted_tasks = []
-        processed_ids = set()
-        pending_tasks = list(self.workflow.tasks)
-        while pending_tasks:
-            progress = False
-            for task in pending_tasks[:]:
-                if all(dep in processed_ids for dep in task.dependencies):
-                    sorted_tasks.append(task)
-                    processed_ids.add(task.name)
-                    pending_tasks.remove(task)
-                    progress = True
-            if not progress: raise Exception("Circular dependency!")
-        return sorted_tasks
+        return topological_sort(self.workflow.tasks)
+
+    def evaluate_schedule(self, schedule):
+        """Simulates a schedule and returns (csv_rows, start_times, finish_times, total_energy)."""
+        assignment = self.model.encode(schedule)
+        result = self.model.simulate(assignment)
+        csv_rows = self.model.build_csv_rows(assignment, result)
+
+        task_start_time = dict(zip(self.model.task_names, result.start))
+        task_finish_time = dict(zip(self.model.task_names, result.finish))
+        return csv_rows, task_start_time, task_finish_time, result.total_energy
 
     def save_results_to_csv(self, schedule, filename):
-        node_free_time = {node: 0 for node in self.cluster.get_all_nodes()}
-        task_finish_time = {}
-        task_start_time = {}
-        
-        sorted_tasks = self.topological_sort()
-        csv_rows = []
-        
-        total_energy = 0
-        
-        for task in sorted_tasks:
-            assigned_node = schedule[task.name]
-            node_type = self.cluster.get_node_type(assigned_node)
-            
-            base_duration = task.duration_profiles[node_type]
-            speed = self.cluster.get_node_speed(assigned_node)
-            duration = base_duration / speed
-            
-            power = self.cluster.get_power_consumption(assigned_node)
-            
-            preferred_type = min(task.duration_profiles, key=task.duration_profiles.get)
-            is_fallback = (node_type != preferred_type)
-            
-            machine_ready = node_free_time[assigned_node]
-            if not task.dependencies:
-                deps_ready = 0
-            else:
-                deps_ready = max(task_finish_time[dep] for dep in task.dependencies)
-                
-            start_time = max(machine_ready, deps_ready)
-            finish_time = start_time + duration
-            
-            node_free_time[assigned_node] = finish_time
-            task_finish_time[task.name] = finish_time
-            task_start_time[task.name] = start_time
-            
-            energy = duration * power
-            total_energy += energy
+        csv_rows, task_start_time, task_finish_time, total_energy = self.evaluate_schedule(schedule)
 
-            csv_rows.append({
-                'Job ID': task.name,
-                'Assigned Node': assigned_node,
-                'Preferred Resource': preferred_type.upper(),
-                'Assigned Resource': node_type.upper(),
-                'Fallback Occurred': "YES" if is_fallback else "No",
-                'Start Time (s)': start_time,
-                'Finish Time (s)': finish_time,
-                'Wait Time (s)': start_time,
-                'Runtime (s)': duration,
-                'Walltime (s)': finish_time,
-                'Energy (J)': energy,
-                'Dependencies': ";".join(task.dependencies) if task.dependencies else "None"
-            })
-            
         # Write CSV
         if csv_rows:
             fieldnames = csv_rows[0].keys()
@@ -4,16 +4,37 @@ import csv
 import copy
 from cluster import Cluster
 from jobs import Workflow
+from simulation import SimulationModel, topological_sort, percentile, cvar
 
 class GeneticScheduler:
-    def __init__(self, cluster, workflow, population_size=100, generations=100, mode='balanced'):
+    def __init__(self, cluster, workflow, population_size=100, generations=100, mode='balanced', seed=None,
+                 robust=None, scenarios=32, cvar_alpha=0.95, boundary=None, allowed_nodes=None,
+                 initial_schedules=None):
         self.cluster = cluster
         self.workflow = workflow
         self.population_size = population_size
         self.generations = generations
         self.mode = mode
+        self.rng = random.Random(seed)
+        # boundary: cluster state left by earlier work (see simulation.BoundaryState)
+        # allowed_nodes: optional subset of nodes this scheduler may assign to
+        self.model = SimulationModel(cluster, workflow, boundary, allowed_nodes)
+        # initial_schedules: known good schedules seeded into the first population
+        self.initial_schedules = initial_schedules if initial_schedules else []
         self.population = [] 
         
+        # Robust mode scores each chromosome over sampled runtime scenarios:
+        #   None   = deterministic (profile durations)
+        #   'p95'  = 95th percentile makespan
+        #   'cvar' = mean makespan of the worst (1 - cvar_alpha) scenarios
+        self.robust = robust
+        self.num_scenarios = scenarios
+        self.cvar_alpha = cvar_alpha
+        self.scenarios = None
+        self.selection_scenarios = None
+        self.fitness_cache = {}
+        self.selection_cache = {}
+        
         self.weight_profiles = {
             'balanced': {'makespan': 1.0, 'energy': 0.001, 'wall': 1.0},
             'speed':    {'makespan': 1.0, 'energy': 0.0001, 'wall': 5.0}, 
@@ -23,75 +44,61 @@ class GeneticScheduler:
         print(f"Scheduler Mode: {mode.upper()}")
         weights = self.weight_profiles[mode]
         print(f"Weights -> Makespan: {weights['makespan']}, Energy: {weights['energy']}, Avg Wall: {weights['wall']}")
+        if robust:
+            print(f"Robust Objective: {robust.upper()} makespan over {scenarios} runtime scenarios")
 
     def generate_heuristic_schedule(self, strategy='time'):
         #FCFS baseline implementation
-        schedule = {}
+        model = self.model
 
-        node_free_time = {}
-        for node in self.cluster.get_all_nodes():
-            node_free_time[node] = 0
-        
-        task_finish_time = {}
+        node_states = model.new_node_states()
         
-        sorted_tasks = self.topological_sort()
+        assignment = [None] * len(model.tasks)
+        finish = [0.0] * len(model.tasks)
         
-        for task in sorted_tasks:
+        for i in range(len(model.tasks)):
             best_node = None
             best_metric = float('inf')
             
-            if not task.dependencies:
-                deps_ready = 0
-            else:
-                deps_ready = max(task_finish_time[dep] for dep in task.dependencies)
-
-            for r_type, base_duration in task.duration_profiles.items():
-                valid_nodes = []
-                for n in self.cluster.get_all_nodes():
-                    if self.cluster.get_node_type(n) == r_type:
-                        valid_nodes.append(n)
-                for node in valid_nodes:
-                    speed = self.cluster.get_node_speed(node)
-                    real_duration = base_duration / speed
-                    
-                    start = max(node_free_time[node], deps_ready)
-                    finish = start + real_duration
-                    
-                    power = self.cluster.get_power_consumption(node)
-                    energy = real_duration * power
+            for node in model.candidates[i]:
+                real_duration = model.runtime[i][node]
+                
+                # Moving parent outputs costs both time and energy
+                deps_ready, transfer_energy = model.data_ready(i, node, assignment, finish)
+                slots, memory = model.demand[i][node]
+                start = node_states[node].earliest_start(deps_ready, real_duration, slots, memory)
+                task_finish = start + real_duration
+                
+                energy = real_duration * model.task_power[i][node] + transfer_energy
+                
+                if strategy == 'time':
+                    current_metric = task_finish
+                elif strategy == 'energy':
+                    current_metric = energy
+                else:
+                    current_metric = task_finish
                     
-                    if strategy == 'time':
-                        current_metric = finish
-                    elif strategy == 'energy':
-                        current_metric = energy
-                    else:
-                        current_metric = finish
-                        
-                    if current_metric < best_metric:
-                        best_metric = current_metric
-                        best_node = node
+                if current_metric < best_metric:
+                    best_metric = current_metric
+                    best_node = node
             
             if best_node is None:
-                valid_nodes = []
-                for n in self.cluster.get_all_nodes():
-                    if self.cluster.get_node_type(n) in task.duration_profiles:
-                        valid_nodes.append(n)
-                best_node = random.choice(valid_nodes)
-                finish = 0 
-
-            schedule[task.name] = best_node
-            
-            r_type = self.cluster.get_node_type(best_node)
-            speed = self.cluster.get_node_speed(best_node)
-            duration = task.duration_profiles[r_type] / speed
-            
-            start = max(node_free_time[best_node], deps_ready)
-            finish = start + duration
+                best_node = self.rng.choice(model.candidates[i])
+
+            deps_ready, _ = model.data_ready(i, best_node, assignment, finish)
+            slots, memory = model.demand[i][best_node]
+            start = node_states[best_node].earliest_start(deps_ready, model.runtime[i][best_node], slots, memory)
             
-            node_free_time[best_node] = finish
-            task_finish_time[task.name] = finish
+            assignment[i] = best_node
+            finish[i] = start + model.runtime[i][best_node]
+            node_states[best_node].place(start, finish[i], slots, memory)
             
-        return schedule
+        return model.decode(assignment)
+
+    def get_valid_nodes(self, task_name):
+        """Nodes the task may run on (matching resource type, within allowed_nodes)."""
+        model = self.model
+        return [model.node_names[n] for n in model.candidates[model.task_index[task_name]]]
 
     def initialize_population(self):
         print(f"Initializing population with {self.population_size} schedules...")
@@ -99,60 +106,80 @@ class GeneticScheduler:
         
         self.population.append(self.generate_heuristic_schedule(strategy='time'))
         self.population.append(self.generate_heuristic_schedule(strategy='energy'))
+        for schedule in self.initial_schedules:
+            self.population.append(dict(schedule))
         
-        all_nodes = self.cluster.get_all_nodes()
-        for _ in range(self.population_size - 2):
+        while len(self.population) < self.population_size:
             chromosome = {}
             for task in self.workflow.tasks:
-                valid_nodes = []
-                for r_type in task.duration_profiles.keys():
-                    for n in all_nodes:
-                        if self.cluster.get_node_type(n) == r_type:
-                            valid_nodes.append(n)
-                
-                if not valid_nodes:
-                    raise Exception(f"Task {task.name} has no valid resources!")
-                
-                chromosome[task.name] = random.choice(valid_nodes)
+                chromosome[task.name] = self.rng.choice(self.get_valid_nodes(task.name))
             self.population.append(chromosome)
 
+    def start_generation(self):
+        """
+        Drops last generation's cached scores and, in robust mode, draws the
+        scenario batch every chromosome of this generation is scored against.
+        """
+        self.fitness_cache = {}
+        if self.robust:
+            self.scenarios = self.model.sample_scenarios(self.num_scenarios, self.rng)
+
     def calculate_fitness(self, chromosome):
-        node_free_time = {}
-        for node in self.cluster.get_all_nodes():
-            node_free_time[node] = 0
-        task_finish_time = {}
-        sorted_tasks = self.topological_sort()
-        
-        total_energy = 0
-        total_wall_time = 0
-        
-        for task in sorted_tasks:
-            assigned_node = chromosome[task.name]
-            node_type = self.cluster.get_node_type(assigned_node)
-            
-            base_duration = task.duration_profiles[node_type]
-            speed_factor = self.cluster.get_node_speed(assigned_node)
-            duration = base_duration / speed_factor
-            
-            power = self.cluster.get_power_consumption(assigned_node)
-            
-            machine_ready = node_free_time[assigned_node]
-            if not task.dependencies:
-                deps_ready = 0
+        assignment = self.model.encode(chromosome)
+        key = tuple(assignment)
+        cached = self.fitness_cache.get(key)
+        if cached is not None:
+            return cached
+
+        fitness = self.score_assignment(assignment)
+        self.fitness_cache[key] = fitness
+        return fitness
+
+    def selection_fitness(self, chromosome):
+        """
+        Score used to pick the schedule run() returns. In robust mode every
+        generation draws its own scenario batch, so generation scores are not
+        comparable with each other (the best one is mostly the luckiest draw).
+        Elites are re-scored on one fixed, larger batch instead.
+        """
+        if not self.robust:
+            return self.calculate_fitness(chromosome)
+
+        assignment = self.model.encode(chromosome)
+        key = tuple(assignment)
+        cached = self.selection_cache.get(key)
+        if cached is not None:
+            return cached
+
+        if self.selection_scenarios is None:
+            self.selection_scenarios = self.model.sample_scenarios(4 * self.num_scenarios, self.rng)
+        generation_scenarios = self.scenarios
+        self.scenarios = self.selection_scenarios
+        fitness = self.score_assignment(assignment)
+        self.scenarios = generation_scenarios
+
+        self.selection_cache[key] = fitness
+        return fitness
+
+    def score_assignment(self, assignment):
+        """Scores an encoded schedule (node index per topological position): (score, makespan, energy)."""
+        if self.robust:
+            if self.scenarios is None:
+                self.scenarios = self.model.sample_scenarios(self.num_scenarios, self.rng)
+            outcome = self.model.simulate_scenarios(assignment, self.scenarios)
+
+            if self.robust == 'cvar':
+                makespan = cvar(outcome.makespan, self.cvar_alpha)
             else:
-                deps_ready = max(task_finish_time[dep] for dep in task.dependencies)
-            
-            start_time = max(machine_ready, deps_ready)
-            finish_time = start_time + duration
-            
-            node_free_time[assigned_node] = finish_time
-            task_finish_time[task.name] = finish_time
-            
-            total_energy += (duration * power)
-            total_wall_time += finish_time
+                makespan = percentile(outcome.makespan, 95)
+            total_energy = sum(outcome.energy) / len(outcome.energy)
+            avg_wall = sum(outcome.avg_wall) / len(outcome.avg_wall)
+        else:
+            result = self.model.simulate(assignment)
 
-        makespan = max(task_finish_time.values())
-        avg_wall = total_wall_time / len(sorted_tasks)
+            makespan = result.makespan
+            total_energy = result.total_energy
+            avg_wall = sum(result.finish) / len(result.finish)
         
         weights = self.weight_profiles[self.mode]
         
@@ -163,30 +190,13 @@ class GeneticScheduler:
         return score, makespan, total_energy
 
     def topological_sort(self):
-        sorted_tasks = []
-        processed_ids = set()
-        pending_tasks = list(self.workflow.tasks)
-        while pending_tasks:
-            progress = False
-            for task in pending_tasks[:]:
-                all_deps_in_processed = True
-                for dep in task.dependencies:
-                    if dep not in processed_ids:
-                        all_deps_in_processed = False
-                        break
-                if all_deps_in_processed:
-                    sorted_tasks.append(task)
-                    processed_ids.add(task.name)
-                    pending_tasks.remove(task)
-                    progress = True
-            if not progress: raise Exception("Circular dependency!")
-        return sorted_tasks
+        return topological_sort(self.workflow.tasks)
     
     def select_parents(self):
         tournament_size = 5
         tournament = []
         for _ in range(tournament_size):
-            tournament.append(random.choice(self.population))
+            tournament.append(self.rng.choice(self.population))
         best = tournament[0]
         best_score = self.calculate_fitness(best)[0]
         for chromo in tournament:
@@ -199,7 +209,7 @@ class GeneticScheduler:
     def crossover(self, parent1, parent2):
         child = {}
         for task_name in parent1.keys():
-            rand_val = random.random()
+            rand_val = self.rng.random()
             if rand_val > 0.5:
                 child[task_name] = parent1[task_name]
             else:
@@ -208,20 +218,21 @@ class GeneticScheduler:
 
     def mutate(self, chromosome):
         mutation_rate = 0.15
-        if random.random() > mutation_rate:
+        if self.rng.random() > mutation_rate:
             return chromosome
 
-        task_to_change = random.choice(list(chromosome.keys()))
-        task = self.workflow.get_task(task_to_change)
+        task_to_change = self.rng.choice(list(chromosome.keys()))
+        task = self.model.tasks[self.model.task_index[task_to_change]]
         
-        valid_nodes = []
-        all_nodes = self.cluster.get_all_nodes()
-        for r_type in task.duration_profiles.keys():
-            for n in all_nodes:
-                if self.cluster.get_node_type(n) == r_type:
-                    valid_nodes.append(n)
+        valid_nodes = self.get_valid_nodes(task_to_change)
         
-        chromosome[task_to_change] = random.choice(valid_nodes)
+        # Locality move: co-locating with a parent avoids shipping its output
+        parent_nodes = [chromosome[dep] for dep in task.dependencies
+                        if dep in chromosome and chromosome[dep] in valid_nodes]
+        if parent_nodes and self.rng.random() < 0.5:
+            chromosome[task_to_change] = self.rng.choice(parent_nodes)
+        else:
+            chromosome[task_to_change] = self.rng.choice(valid_nodes)
         return chromosome
 
     def run(self):
@@ -231,6 +242,7 @@ class GeneticScheduler:
         print(f"Starting evolution for {self.generations} generations...")
 
         for generation in range(self.generations):
+            self.start_generation()
             scored_pop = []
             for chromo in self.population:
                 score, makespan, energy = self.calculate_fitness(chromo)
@@ -238,10 +250,11 @@ class GeneticScheduler:
 
             scored_pop.sort(key=lambda x: x[0])
             current_best_score = scored_pop[0][0]
-            current_best_chromo = scored_pop[0][1]
             
-            if best_overall is None or current_best_score < best_overall[0]:
-                best_overall = (current_best_score, current_best_chromo)
+            for _, elite in scored_pop[:2]:
+                elite_score = self.selection_fitness(elite)[0]
+                if best_overall is None or elite_score < best_overall[0]:
+                    best_overall = (elite_score, elite)
             
             if generation % 10 == 0:
                 print(f"Gen {generation:<3} | Best Score: {current_best_score:.2f}")
@@ -262,59 +275,19 @@ class GeneticScheduler:
         print(f"Evolution Complete. Best Score: {best_overall[0]:.2f}")
         return best_overall[1]
 
+    def evaluate_schedule(self, chromosome):
+        """Simulates a schedule and returns (csv_rows, start_times, finish_times, total_energy)."""
+        assignment = self.model.encode(chromosome)
+        result = self.model.simulate(assignment)
+        csv_rows = self.model.build_csv_rows(assignment, result)
+
+        task_start_time = dict(zip(self.model.task_names, result.start))
+        task_finish_time = dict(zip(self.model.task_names, result.finish))
+        return csv_rows, task_start_time, task_finish_time, result.total_energy
+
     def save_results_to_csv(self, chromosome, filename):
-        node_free_time = {node: 0 for node in self.cluster.get_all_nodes()}
-        task_finish_time = {}
-        task_start_time = {}
-        
-        sorted_tasks = self.topological_sort()
-        csv_rows = []
-        total_energy = 0
-        
-        for task in sorted_tasks:
-            assigned_node = chromosome[task.name]
-            node_type = self.cluster.get_node_type(assigned_node)
-            
-            base_duration = task.duration_profiles[node_type]
-            speed_factor = self.cluster.get_node_speed(assigned_node)
-            duration = base_duration / speed_factor
-            
-            power = self.cluster.get_power_consumption(assigned_node)
-            
-            preferred_type = min(task.duration_profiles, key=task.duration_profiles.get)
-            is_fallback = (node_type != preferred_type)
-            
-            machine_ready = node_free_time[assigned_node]
-            if not task.dependencies:
-                deps_ready = 0
-            else:
-                deps_ready = max(task_finish_time[dep] for dep in task.dependencies)
-                
-            start_time = max(machine_ready, deps_ready)
-            finish_time = start_time + duration
-            
-            node_free_time[assigned_node] = finish_time
-            task_finish_time[task.name] = finish_time
-            task_start_time[task.name] = start_time
-            
-            energy = duration * power
-            total_energy += energy
-
-            csv_rows.append({
-                'Job ID': task.name,
-                'Assigned Node': assigned_node,
-                'Preferred Resource': preferred_type.upper(),
-                'Assigned Resource': node_type.upper(),
-                'Fallback Occurred': "YES" if is_fallback else "No",
-                'Start Time (s)': start_time,
-                'Finish Time (s)': finish_time,
-                'Wait Time (s)': start_time,
-                'Runtime (s)': duration,
-                'Walltime (s)': finish_time,
-                'Energy (J)': energy,
-                'Dependencies': ";".join(task.dependencies) if task.dependencies else "None"
-            })
-            
+        csv_rows, task_start_time, task_finish_time, total_energy = self.evaluate_schedule(chromosome)
+
         if csv_rows:
             fieldnames = csv_rows[0].keys()
             try:
@@ -328,6 +301,18 @@ class GeneticScheduler:
 
         self.print_results_summary(task_start_time, task_finish_time, chromosome, total_energy)
 
+    def print_robustness_summary(self, chromosome, num_scenarios=1000):
+        """Re-evaluates a schedule on a fresh, larger scenario sample."""
+        scenarios = self.model.sample_scenarios(num_scenarios, random.Random(self.rng.random()))
+        outcome = self.model.simulate_scenarios(self.model.encode(chromosome), scenarios)
+        mean_makespan = sum(outcome.makespan) / num_scenarios
+
+        print(f"\n--- Makespan over {num_scenarios} Runtime Scenarios ---")
+        print(f"Mean: {mean_makespan:.2f} s")
+        print(f"P95:  {percentile(outcome.makespan, 95):.2f} s")
+        print(f"CVaR ({self.cvar_alpha:.2f}): {cvar(outcome.makespan, self.cvar_alpha):.2f} s")
+        print("-----------------------------------------")
+
     def print_results_summary(self, task_start_time, task_finish_time, chromosome, total_energy):
         first_start = min(task_start_time.values())
         last_finish = max(task_finish_time.values())
@@ -338,9 +323,9 @@ class GeneticScheduler:
         fallback_count = 0
         
         for task_name, assigned_node in chromosome.items():
-            task = self.workflow.get_task(task_name)
-            wait_times.append(task_start_time[task_name])
-            wall_times.append(task_finish_time[task_name])
+            task = self.model.tasks[self.model.task_index[task_name]]
+            wait_times.append(task_start_time[task_name] - task.release_time)
+            wall_times.append(task_finish_time[task_name] - task.release_time)
             
             preferred = min(task.duration_profiles, key=task.duration_profiles.get)
             node_type = self.cluster.get_node_type(assigned_node)
@@ -371,6 +356,9 @@ if __name__ == "__main__":
     parser.add_argument("--pop", type=int, default=100, help="Population size")
     parser.add_argument("--mode", type=str, default="balanced", choices=['speed', 'energy', 'balanced'],
                         help="Optimization Mode: speed, energy, or balanced")
+    parser.add_argument("--robust", type=str, default=None, choices=['p95', 'cvar'],
+                        help="Optimize tail makespan over sampled runtimes instead of fixed durations")
+    parser.add_argument("--scenarios", type=int, default=32, help="Runtime scenarios per generation (robust mode)")
     
     args = parser.parse_args()
     
@@ -382,7 +370,10 @@ if __name__ == "__main__":
     else:
         w.generate_random_workflow(num_tasks=args.tasks, seed=args.seed)
     
-    ai = GeneticScheduler(c, w, population_size=args.pop, generations=args.gens, mode=args.mode)
+    ai = GeneticScheduler(c, w, population_size=args.pop, generations=args.gens, mode=args.mode, seed=args.seed,
+                          robust=args.robust, scenarios=args.scenarios)
     best_schedule = ai.run()
     
-    ai.save_results_to_csv(best_schedule, args.output)
\ No newline at end of file
+    ai.save_results_to_csv(best_schedule, args.output)
+    if args.robust:
+        ai.print_robustness_summary(best_schedule)
\ No newline at end of file
@@ -1,10 +1,31 @@
 import random
 
 class Task:
-    def __init__(self, name, duration_profiles, dependencies=None):
+    def __init__(self, name, duration_profiles, dependencies=None, data_sizes=None, runtime_dist=None,
+                 release_time=0, demands=None):
         self.name = name
         self.duration_profiles = duration_profiles
         self.dependencies = dependencies if dependencies else []
+        # MB of output each parent hands to this task {parent_name: size_mb}
+        self.data_sizes = data_sizes if data_sizes else {}
+        # Optional runtime multiplier distribution, e.g. {'type': 'lognormal', 'sigma': 0.3}
+        # or {'type': 'uniform', 'low': 0.8, 'high': 1.5}. None = fixed durations.
+        self.runtime_dist = runtime_dist
+        # Earliest time the task may start (when its workflow was submitted)
+        self.release_time = release_time
+        # Resources held while running, per resource type:
+        # {'cpu': {'slots': 4, 'memory': 16}, 'gpu': {'slots': 1, 'memory': 10}}
+        # Missing entries default to one slot and no memory.
+        self.demands = demands if demands else {}
+
+    def get_demand(self, r_type):
+        """Returns (slots, memory_gb) the task occupies on a node of the given type."""
+        demand = self.demands.get(r_type, {})
+        return demand.get('slots', 1), demand.get('memory', 0)
+
+    def get_data_size(self, dependency):
+        """MB transferred from a parent task to this task (0 if unspecified)."""
+        return self.data_sizes.get(dependency, 0)
 
 class Workflow:
     def __init__(self):
@@ -19,47 +40,68 @@ class Workflow:
     def create_sample_workflow(self):
         self.tasks = [
             Task("job_1", {'cpu': 200, 'gpu': 20}),
-            Task("job_2", {'cpu': 400, 'gpu': 40}, dependencies=["job_1"]),
+            Task("job_2", {'cpu': 400, 'gpu': 40}, dependencies=["job_1"], data_sizes={"job_1": 2000}),
             Task("job_3", {'cpu': 200}),
-            Task("job_4", {'gpu': 50, 'cpu': 500}, dependencies=["job_1"]),
-            Task("job_5", {'cpu': 300}, dependencies=["job_2", "job_3"])
+            Task("job_4", {'gpu': 50, 'cpu': 500}, dependencies=["job_1"], data_sizes={"job_1": 500}),
+            Task("job_5", {'cpu': 300}, dependencies=["job_2", "job_3"], data_sizes={"job_2": 1000, "job_3": 200})
         ]
 
     def generate_random_workflow(self, num_tasks=20, seed=42):
         """
         Generates a random DAG (Directed Acyclic Graph) of tasks.
         With REALISTIC Penalties for architecture mismatches.
+        Uses its own RNG so workflows built in the same process don't
+        disturb each other (or the global random state).
         """
-        random.seed(seed)
+        rng = random.Random(seed)
         self.tasks = []
         
         for i in range(num_tasks):
             # 70% CPU tasks, 30% GPU tasks
-            is_gpu_task = (random.random() < 0.3)
+            is_gpu_task = (rng.random() < 0.3)
             
             profiles = {}
             
             if is_gpu_task:
-                gpu_time = random.randint(200, 600)
+                gpu_time = rng.randint(200, 600)
                 profiles['gpu'] = gpu_time
                 # Penalty: 20x slower on CPU
                 profiles['cpu'] = gpu_time * 20 
             else:
-                cpu_time = random.randint(100, 1000)
+                cpu_time = rng.randint(100, 1000)
                 profiles['cpu'] = cpu_time
                 
                 profiles['gpu'] = cpu_time * 10.0 
 
             deps = []
             if i > 0:
-                if random.random() < 0.4:
-                    num_deps = random.randint(1, 4)
+                if rng.random() < 0.4:
+                    num_deps = rng.randint(1, 4)
                     window_start = max(0, i - 10)
                     potential_parents = [t.name for t in self.tasks[window_start:i]]
                     
                     if potential_parents:
-                        deps = random.sample(potential_parents, min(len(potential_parents), num_deps))
+                        deps = rng.sample(potential_parents, min(len(potential_parents), num_deps))
             
             self.tasks.append(Task(f"job_{i}", profiles, deps))
 
+        # Intermediate output sizes are drawn in a second pass so the DAG
+        # itself stays identical to older runs with the same seed.
+        for task in self.tasks:
+            task.data_sizes = {dep: rng.randint(100, 10000) for dep in task.dependencies}
+
+        # Runtime noise: most jobs are fairly stable, a few have heavy tails
+        for task in self.tasks:
+            task.runtime_dist = {'type': 'lognormal', 'sigma': rng.choice([0.1, 0.1, 0.2, 0.3, 0.6])}
+
+        # Resource demands: a few cores on CPU hosts, one or more MIG slices on GPUs
+        # (tasks wanting several slices only fit on the A100s)
+        for task in self.tasks:
+            cpu_slots = rng.choice([1, 2, 4, 8])
+            gpu_slots = rng.choice([1, 1, 1, 2, 3])
+            task.demands = {
+                'cpu': {'slots': cpu_slots, 'memory': cpu_slots * rng.randint(1, 8)},
+                'gpu': {'slots': gpu_slots, 'memory': gpu_slots * rng.randint(4, 10)},
+            }
+
         print(f"Generating workflow with {num_tasks} tasks...")
\ No newline at end of file
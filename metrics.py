@@ -0,0 +1,16 @@
+def compute_metrics(csv_rows):
+    """
+    Summarizes a simulated schedule (the rows produced by evaluate_schedule).
+    Same metrics data_visualization.py derives from the CSV files.
+    """
+    finish_times = [row['Finish Time (s)'] for row in csv_rows]
+    wait_times = [row['Wait Time (s)'] for row in csv_rows]
+    wall_times = [row['Walltime (s)'] for row in csv_rows]
+
+    return {
+        'makespan': max(finish_times),
+        'energy': sum(row['Energy (J)'] for row in csv_rows),
+        'fallbacks': sum(1 for row in csv_rows if row['Fallback Occurred'] == 'YES'),
+        'avg_wait': sum(wait_times) / len(wait_times),
+        'avg_wall': sum(wall_times) / len(wall_times),
+    }
@@ -0,0 +1,207 @@
+import argparse
+import contextlib
+import io
+import random
+from cluster import Cluster
+from jobs import Task, Workflow
+from fcfs import FCFSScheduler
+from genetic_scheduler import GeneticScheduler
+from simulation import SimulationModel
+
+class TenantWorkflow:
+    """One user's workflow in a shared batch."""
+    def __init__(self, tenant, workflow, priority=1.0, release_time=0.0, deadline=None):
+        self.tenant = tenant
+        self.workflow = workflow
+        self.priority = priority          # fair-share weight (higher = more important)
+        self.release_time = release_time  # submission time, nothing starts earlier
+        self.deadline = deadline          # absolute time, None = best effort
+
+def critical_path(cluster, workflow):
+    """
+    Length of the workflow on an empty cluster (best node per task, no transfers).
+    Only nodes the task's demands fit on count, as in every simulator.
+    """
+    model = SimulationModel(cluster, workflow)
+    fastest = {}
+    earliest_finish = {}
+    for i, task in enumerate(model.tasks):
+        fastest[task.name] = min(model.runtime[i][n] for n in model.candidates[i])
+        ready = max((earliest_finish[dep] for dep in task.dependencies), default=0.0)
+        earliest_finish[task.name] = ready + fastest[task.name]
+    return max(earliest_finish.values(), default=0.0), earliest_finish, fastest
+
+def merge_workflows(cluster, tenants):
+    """
+    Combines a batch into one Workflow with tenant-prefixed task names.
+    Returns (workflow, {merged_task_name: tenant_position}).
+
+    Task order decides who queues first on a shared node, so instead of
+    concatenating the workflows (which runs them back to back) tasks are
+    interleaved by their earliest possible start, stretched by 1/priority.
+    The key grows along every dependency, so the order stays topological.
+    """
+    entries = []
+    owner = {}
+    for t, tenant in enumerate(tenants):
+        _, earliest_finish, fastest = critical_path(cluster, tenant.workflow)
+        prefix = f"{tenant.tenant}/"
+        for position, task in enumerate(tenant.workflow.tasks):
+            earliest_start = earliest_finish[task.name] - fastest[task.name]
+            key = tenant.release_time + earliest_start / tenant.priority
+            merged = Task(prefix + task.name, task.duration_profiles,
+                          [prefix + dep for dep in task.dependencies],
+                          {prefix + dep: size for dep, size in task.data_sizes.items()},
+                          task.runtime_dist, release_time=tenant.release_time, demands=task.demands)
+            entries.append(((key, -tenant.priority, t, position), merged))
+            owner[merged.name] = t
+
+    entries.sort(key=lambda entry: entry[0])
+    workflow = Workflow()
+    workflow.tasks = [task for _, task in entries]
+    return workflow, owner
+
+class MultiTenantScheduler(GeneticScheduler):
+    """
+    Jointly schedules a batch of workflows on the shared cluster with the GA.
+
+    Fitness is fair-share and deadline aware, all terms dimensionless:
+        slowdown   = priority-weighted mean of (tenant makespan / isolated critical path)
+        fairness   = worst tenant slowdown
+        misses     = number of tenants finishing after their deadline
+        tardiness  = sum of lateness / isolated critical path
+        energy     = total energy / lower bound (every task on its cheapest node)
+    Tenant makespans come from a single pass over the compiled simulation
+    result using a precomputed task -> tenant index.
+    """
+    def __init__(self, cluster, tenants, population_size=100, generations=100, mode='balanced', seed=None):
+        self.tenants = tenants
+        merged, owner = merge_workflows(cluster, tenants)
+        super().__init__(cluster, merged, population_size=population_size,
+                         generations=generations, mode=mode, seed=seed)
+
+        self.tenant_weights = {
+            'balanced': {'slowdown': 1.0, 'fairness': 1.0, 'misses': 5.0, 'tardiness': 2.0, 'energy': 1.0},
+            'speed':    {'slowdown': 1.0, 'fairness': 1.0, 'misses': 5.0, 'tardiness': 2.0, 'energy': 0.1},
+            'energy':   {'slowdown': 0.2, 'fairness': 0.2, 'misses': 5.0, 'tardiness': 2.0, 'energy': 5.0},
+        }
+        weights = self.tenant_weights[mode]
+        print(f"Tenant Weights -> Slowdown: {weights['slowdown']}, Fairness: {weights['fairness']}, "
+              f"Misses: {weights['misses']}, Tardiness: {weights['tardiness']}, Energy: {weights['energy']}")
+
+        self.task_tenant = [owner[name] for name in self.model.task_names]
+        self.isolated_makespan = [critical_path(cluster, tenant.workflow)[0] for tenant in tenants]
+        total_priority = sum(tenant.priority for tenant in tenants)
+        self.share = [tenant.priority / total_priority for tenant in tenants]
+
+        model = self.model
+        self.energy_lower_bound = sum(min(model.runtime[i][n] * model.task_power[i][n] for n in model.candidates[i])
+                                      for i in range(len(model.tasks)))
+
+    def tenant_finish_times(self, finish):
+        """Last finish time per tenant from a per-task finish list."""
+        last = [0.0] * len(self.tenants)
+        for t, finish_time in zip(self.task_tenant, finish):
+            if finish_time > last[t]:
+                last[t] = finish_time
+        return last
+
+    def score_assignment(self, assignment):
+        result = self.model.simulate(assignment)
+        weights = self.tenant_weights[self.mode]
+
+        weighted_slowdown = 0.0
+        worst_slowdown = 0.0
+        misses = 0
+        tardiness = 0.0
+        for t, finish_time in enumerate(self.tenant_finish_times(result.finish)):
+            tenant = self.tenants[t]
+            slowdown = (finish_time - tenant.release_time) / self.isolated_makespan[t]
+            weighted_slowdown += self.share[t] * slowdown
+            worst_slowdown = max(worst_slowdown, slowdown)
+            if tenant.deadline is not None and finish_time > tenant.deadline:
+                misses += 1
+                tardiness += (finish_time - tenant.deadline) / self.isolated_makespan[t]
+
+        total_energy = result.total_energy
+        score = (weighted_slowdown * weights['slowdown']) + \
+                (worst_slowdown * weights['fairness']) + \
+                (misses * weights['misses']) + \
+                (tardiness * weights['tardiness']) + \
+                (total_energy / self.energy_lower_bound * weights['energy'])
+
+        return score, result.makespan, total_energy
+
+    def tenant_report(self, schedule):
+        """Per-tenant outcome of a schedule on the merged batch workflow."""
+        result = self.model.simulate(self.model.encode(schedule))
+        report = []
+        for t, finish_time in enumerate(self.tenant_finish_times(result.finish)):
+            tenant = self.tenants[t]
+            makespan = finish_time - tenant.release_time
+            report.append({
+                'tenant': tenant.tenant,
+                'priority': tenant.priority,
+                'release': tenant.release_time,
+                'deadline': tenant.deadline,
+                'finish': finish_time,
+                'makespan': makespan,
+                'slowdown': makespan / self.isolated_makespan[t],
+                'missed': tenant.deadline is not None and finish_time > tenant.deadline,
+            })
+        return report, result
+
+def print_tenant_report(title, report, result):
+    print(f"\n--- {title} ---")
+    print(f"{'Tenant':<10} {'Prio':>5} {'Release':>9} {'Deadline':>10} {'Finish':>10} {'Makespan':>10} {'Slowdown':>9}  Deadline")
+    for row in report:
+        deadline = f"{row['deadline']:.0f}" if row['deadline'] is not None else "-"
+        status = "MISSED" if row['missed'] else ("met" if row['deadline'] is not None else "-")
+        print(f"{row['tenant']:<10} {row['priority']:>5.1f} {row['release']:>9.0f} {deadline:>10} "
+              f"{row['finish']:>10.1f} {row['makespan']:>10.1f} {row['slowdown']:>9.2f}  {status}")
+    print(f"Cluster makespan: {result.makespan:.2f} s | Total energy: {result.total_energy:.2f} J | "
+          f"Deadline misses: {sum(1 for row in report if row['missed'])}")
+
+def generate_random_batch(cluster, num_tenants=6, tasks_per_tenant=30, seed=42):
+    """Random tenants with staggered submissions, mixed priorities and deadlines for some."""
+    rng = random.Random(seed)
+    tenants = []
+    release = 0.0
+    for k in range(num_tenants):
+        workflow = Workflow()
+        with contextlib.redirect_stdout(io.StringIO()):
+            workflow.generate_random_workflow(num_tasks=tasks_per_tenant, seed=seed * 1000 + k)
+        isolated = critical_path(cluster, workflow)[0]
+        deadline = release + isolated * rng.uniform(1.5, 4.0) if rng.random() < 0.6 else None
+        tenants.append(TenantWorkflow(f"user_{k}", workflow, priority=rng.choice([1.0, 1.0, 2.0, 4.0]),
+                                      release_time=release, deadline=deadline))
+        release += rng.uniform(0, isolated / 2)
+    return tenants
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Jointly schedule a batch of tenant workflows")
+    parser.add_argument("--tenants", type=int, default=6, help="Number of tenant workflows")
+    parser.add_argument("--tasks", type=int, default=30, help="Tasks per tenant workflow")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--gens", type=int, default=100, help="Generations to evolve")
+    parser.add_argument("--pop", type=int, default=100, help="Population size")
+    parser.add_argument("--mode", type=str, default="balanced", choices=['speed', 'energy', 'balanced'],
+                        help="Optimization Mode: speed, energy, or balanced")
+    parser.add_argument("--output", type=str, default="multitenant_results.csv", help="Output CSV file")
+
+    args = parser.parse_args()
+
+    c = Cluster()
+    batch = generate_random_batch(c, num_tenants=args.tenants, tasks_per_tenant=args.tasks, seed=args.seed)
+
+    ai = MultiTenantScheduler(c, batch, population_size=args.pop, generations=args.gens,
+                              mode=args.mode, seed=args.seed)
+
+    fcfs = FCFSScheduler(c, ai.workflow)
+    fcfs_schedule, _, _ = fcfs.run()
+    print_tenant_report("Batch Results (FCFS)", *ai.tenant_report(fcfs_schedule))
+
+    best_schedule = ai.run()
+    print_tenant_report("Batch Results (Multi-Tenant GA)", *ai.tenant_report(best_schedule))
+
+    ai.save_results_to_csv(best_schedule, args.output)
@@ -0,0 +1,100 @@
+import argparse
+import csv
+import os
+import time
+from cluster import Cluster
+from jobs import Workflow
+from metrics import compute_metrics
+
+SCHEDULER_LABELS = {'fcfs': 'FCFS', 'genetic': 'Genetic', 'hierarchical': 'Hierarchical'}
+
+def run_scheduler(name, cluster, workflow, args):
+    """Runs one scheduler on the shared workflow and returns its per-task result rows."""
+    if name == 'fcfs':
+        from fcfs import FCFSScheduler
+        scheduler = FCFSScheduler(cluster, workflow)
+        schedule, _, _ = scheduler.run()
+    elif name == 'genetic':
+        from genetic_scheduler import GeneticScheduler
+        scheduler = GeneticScheduler(cluster, workflow, population_size=args.pop, generations=args.gens,
+                                     mode=args.mode, seed=args.seed, robust=args.robust,
+                                     scenarios=args.scenarios)
+        schedule = scheduler.run()
+    elif name == 'hierarchical':
+        from decomposition import HierarchicalScheduler
+        scheduler = HierarchicalScheduler(cluster, workflow, chunk_size=args.chunk, population_size=args.pop,
+                                          generations=args.gens, mode=args.mode, seed=args.seed,
+                                          workers=args.workers)
+        schedule = scheduler.run()
+    else:
+        raise ValueError(f"Unknown scheduler: {name}")
+
+    return scheduler.evaluate_schedule(schedule)[0]
+
+def write_rows(rows, filename):
+    with open(filename, mode='w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=rows[0].keys())
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Detailed schedule written to: {filename}")
+
+def print_comparison(results, timings):
+    print("\n--- Comparison ---")
+    header = f"{'Scheduler':<14} {'Makespan (s)':>14} {'Energy (J)':>16} {'Fallbacks':>10} {'Avg Wait (s)':>13} {'Avg Wall (s)':>13} {'Runtime (s)':>12}"
+    print(header)
+    print("-" * len(header))
+    for label, rows in results.items():
+        m = compute_metrics(rows)
+        print(f"{label:<14} {m['makespan']:>14.2f} {m['energy']:>16.2f} {m['fallbacks']:>10} "
+              f"{m['avg_wait']:>13.2f} {m['avg_wall']:>13.2f} {timings[label]:>12.3f}")
+    print("-" * len(header))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare schedulers on one workflow in a single process")
+    parser.add_argument("--tasks", type=int, default=20, help="Number of tasks")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--simple", action="store_true", help="Use the small sample workflow")
+    parser.add_argument("--schedulers", type=str, nargs='+', default=['fcfs', 'genetic'],
+                        choices=list(SCHEDULER_LABELS), help="Schedulers to run (first is the baseline)")
+    parser.add_argument("--mode", type=str, default="balanced", choices=['speed', 'energy', 'balanced'],
+                        help="GA optimization mode")
+    parser.add_argument("--gens", type=int, default=100, help="GA generations")
+    parser.add_argument("--pop", type=int, default=100, help="GA population size")
+    parser.add_argument("--robust", type=str, default=None, choices=['p95', 'cvar'],
+                        help="GA tail-makespan objective over sampled runtimes")
+    parser.add_argument("--scenarios", type=int, default=32, help="Runtime scenarios per generation (robust mode)")
+    parser.add_argument("--chunk", type=int, default=500, help="Tasks per chunk (hierarchical)")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (hierarchical)")
+    parser.add_argument("--csv-dir", type=str, default=None, help="Also write <scheduler>_results.csv files here")
+    parser.add_argument("--plots", action="store_true", help="Generate comparison plots")
+    parser.add_argument("--plot-dir", type=str, default="visualizations", help="Directory for plots")
+
+    args = parser.parse_args(argv)
+
+    c = Cluster()
+    w = Workflow()
+    if args.simple:
+        w.create_sample_workflow()
+    else:
+        w.generate_random_workflow(num_tasks=args.tasks, seed=args.seed)
+
+    results = {}
+    timings = {}
+    for name in args.schedulers:
+        label = SCHEDULER_LABELS[name]
+        start = time.perf_counter()
+        results[label] = run_scheduler(name, c, w, args)
+        timings[label] = time.perf_counter() - start
+
+        if args.csv_dir:
+            os.makedirs(args.csv_dir, exist_ok=True)
+            write_rows(results[label], os.path.join(args.csv_dir, f"{name}_results.csv"))
+
+    print_comparison(results, timings)
+
+    if args.plots:
+        from data_visualization import plot_comparison
+        plot_comparison(results, args.plot_dir)
+
+if __name__ == "__main__":
+    main()
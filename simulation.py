@@ -0,0 +1,680 @@
+import math
+from bisect import bisect_right
+
+# Breakpoints of recent history a NodeProfile keeps open for backfilling
+BACKFILL_WINDOW = 256
+# Walks shorter than this many segments are cheaper than consulting search hints
+HINT_SEGMENTS = 16
+
+def topological_sort(tasks, completed=None):
+    """
+    Orders tasks so every task comes after its dependencies.
+    Tasks are taken in passes over the pending list, keeping the original
+    order wherever the dependencies allow it. Dependencies listed in
+    `completed` (already scheduled elsewhere) count as satisfied.
+    """
+    sorted_tasks = []
+    processed_ids = set(completed) if completed else set()
+    pending_tasks = list(tasks)
+    while pending_tasks:
+        remaining = []
+        for task in pending_tasks:
+            if all(dep in processed_ids for dep in task.dependencies):
+                sorted_tasks.append(task)
+                processed_ids.add(task.name)
+            else:
+                remaining.append(task)
+        if len(remaining) == len(pending_tasks): raise Exception("Circular dependency!")
+        pending_tasks = remaining
+    return sorted_tasks
+
+def sample_runtime_factor(rng, dist):
+    """Draws one runtime multiplier from a distribution spec (None = always 1.0)."""
+    if not dist:
+        return 1.0
+    kind = dist.get('type', 'lognormal')
+    if kind == 'lognormal':
+        # Mean-one lognormal, so the profile durations stay the expected runtimes
+        sigma = dist['sigma']
+        return math.exp(rng.gauss(-0.5 * sigma * sigma, sigma))
+    if kind == 'uniform':
+        return rng.uniform(dist['low'], dist['high'])
+    raise ValueError(f"Unknown runtime distribution: {kind}")
+
+def percentile(values, q):
+    """Nearest-rank percentile, q in [0, 100]."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+def cvar(values, alpha=0.95):
+    """Conditional value at risk: mean of the worst (1 - alpha) share of values."""
+    ordered = sorted(values, reverse=True)
+    tail = max(1, math.ceil((1.0 - alpha) * len(ordered)))
+    return sum(ordered[:tail]) / tail
+
+class RuntimeScenarios:
+    """
+    K sampled runtime scenarios. Factors are stored as length-K lists per task
+    and per node class so a whole batch is advanced together during simulation.
+    """
+    def __init__(self, task_factors, group_factors, num_scenarios):
+        self.task_factors = task_factors    # [task_position][k]
+        self.group_factors = group_factors  # [group_index][k]
+        self.num_scenarios = num_scenarios
+
+class ScenarioResult:
+    """Per-scenario summary metrics of one schedule over a RuntimeScenarios batch."""
+    def __init__(self, makespan, energy, avg_wall):
+        self.makespan = makespan
+        self.energy = energy
+        self.avg_wall = avg_wall
+
+class NodeState:
+    """
+    Availability of an exclusive (single-slot) node during list scheduling:
+    tasks run one at a time in the order they are placed, so the node is
+    described by the time its last task finishes.
+    """
+    __slots__ = ('free_time',)
+
+    def __init__(self, free_time=0.0):
+        self.free_time = free_time
+
+    def earliest_start(self, ready, duration, slots, memory):
+        """Earliest time >= ready the task can start. Doesn't modify the node."""
+        return ready if ready > self.free_time else self.free_time
+
+    def place(self, start, end, slots, memory):
+        """Books a task that runs on the node from start to end."""
+        self.free_time = end
+
+    def book(self, ready, duration, slots, memory):
+        """Places a task at its earliest start and returns that start."""
+        start = ready if ready > self.free_time else self.free_time
+        self.free_time = start + duration
+        return start
+
+    def copy(self):
+        return NodeState(self.free_time)
+
+class NodeProfile:
+    """
+    Availability profile of a shared (multi-slot) node: free slots and memory
+    as a step function of time. Segment j covers [times[j], times[j + 1]), the
+    last one lasts forever and always has the whole node free.
+
+    A task goes into the first gap at or after its ready time where its demand
+    fits for its whole duration, so it can run next to (or before) tasks that
+    were placed earlier but start later. Finding the gap is a bisect to the
+    ready time plus a walk over the segments the task would overlap.
+
+    Free capacity only ever shrinks, so once a search has shown that a demand
+    of (slots, memory) for at least D seconds fits nowhere before time T, that
+    stays true for good, and for longer tasks too. `hints` keeps those (D, T)
+    pairs per demand from long searches, so tasks that are ready early (e.g.
+    roots of a late chunk) skip the packed history instead of walking it
+    again.
+
+    Backfilling only reaches back over the last BACKFILL_WINDOW breakpoints:
+    once a profile holds twice that many, the older segments are dropped and
+    nothing may start before the first one left. Profiles (and copying them
+    for every simulation) stay bounded however much work a node has done,
+    and since the cut only depends on the profile itself, scheduling in
+    chunks gives the same result as scheduling everything at once.
+    """
+    __slots__ = ('times', 'free_slots', 'free_memory', 'hints')
+
+    def __init__(self, slots=1, memory=float('inf'), times=None, free_slots=None, free_memory=None, hints=None):
+        self.times = times if times is not None else [0.0]
+        self.free_slots = free_slots if free_slots is not None else [slots]
+        self.free_memory = free_memory if free_memory is not None else [memory]
+        self.hints = hints if hints is not None else {}  # {(slots, memory): ([duration, ...], [time, ...])}
+
+    def find(self, ready, duration, slots, memory):
+        """(earliest start >= ready where the task fits, index of the segment holding it)."""
+        times = self.times
+        last = len(times) - 1
+        if ready >= times[last]:
+            return ready, last
+
+        free_slots = self.free_slots
+        free_memory = self.free_memory
+        floor = times[0]
+        start = ready if ready > floor else floor
+        k = bisect_right(times, start) - 1
+        if last - k > HINT_SEGMENTS and self.hints:
+            # Far behind the end of the profile: let the hints skip what is known to be full
+            for (hint_slots, hint_memory), (durations, starts) in self.hints.items():
+                if hint_slots <= slots and hint_memory <= memory:
+                    h = bisect_right(durations, duration) - 1
+                    if h >= 0 and starts[h] > floor:
+                        floor = starts[h]
+            if floor > start:
+                start = floor
+                k = bisect_right(times, start) - 1
+
+        end = start + duration
+        first = begin = k
+        while k < last and times[k] < end:
+            if free_slots[k] < slots or free_memory[k] < memory:
+                # Blocked: the earliest candidate is when this segment ends
+                start = times[k + 1]
+                end = start + duration
+                first = k + 1
+            k += 1
+        if floor >= ready and first - begin > HINT_SEGMENTS:
+            # Nothing fits before `start` at all: remember it for this demand
+            self.learn(slots, memory, duration, start)
+        return start, first
+
+    def learn(self, slots, memory, duration, start):
+        """Records that (slots, memory) for `duration` fits nowhere before `start`."""
+        durations, starts = self.hints.setdefault((slots, memory), ([], []))
+        h = bisect_right(durations, duration)
+        if h > 0 and starts[h - 1] >= start:
+            return
+        # Drop entries for longer tasks that this one now outdoes
+        end = h
+        while end < len(durations) and starts[end] <= start:
+            end += 1
+        durations[h:end] = [duration]
+        starts[h:end] = [start]
+
+    def earliest_start(self, ready, duration, slots, memory):
+        """Earliest time >= ready the task fits for `duration`. Only updates the search hint."""
+        return self.find(ready, duration, slots, memory)[0]
+
+    def split(self, t):
+        """Index of the segment starting exactly at t, adding a breakpoint if needed."""
+        times = self.times
+        k = bisect_right(times, t) - 1
+        if times[k] == t:
+            return k
+        times.insert(k + 1, t)
+        self.free_slots.insert(k + 1, self.free_slots[k])
+        self.free_memory.insert(k + 1, self.free_memory[k])
+        return k + 1
+
+    def place(self, start, end, slots, memory):
+        """Books a task that runs on the node from start to end."""
+        if end <= start:
+            return
+        times = self.times
+        if start >= times[-1]:
+            # Starts after everything booked so far: extend the profile
+            free_slots = self.free_slots
+            free_memory = self.free_memory
+            node_slots, node_memory = free_slots[-1], free_memory[-1]
+            if start > times[-1]:
+                times.append(start)
+                free_slots.append(node_slots - slots)
+                free_memory.append(node_memory - memory)
+            else:
+                free_slots[-1] = node_slots - slots
+                free_memory[-1] = node_memory - memory
+            times.append(end)
+            free_slots.append(node_slots)
+            free_memory.append(node_memory)
+        else:
+            first = self.split(start)
+            last = self.split(end)
+            free_slots = self.free_slots
+            free_memory = self.free_memory
+            for k in range(first, last):
+                free_slots[k] -= slots
+                free_memory[k] -= memory
+        if len(times) > 2 * BACKFILL_WINDOW:
+            self.forget()
+
+    def book(self, ready, duration, slots, memory):
+        """
+        Places a task at its earliest start and returns that start. Same result
+        as earliest_start() + place(), but books from the segment the search
+        ended on (this is the inner loop of every simulation).
+        """
+        start, k = self.find(ready, duration, slots, memory)
+        if duration <= 0:
+            return start
+
+        times = self.times
+        free_slots = self.free_slots
+        free_memory = self.free_memory
+        end = start + duration
+        if times[k] != start:
+            k += 1
+            times.insert(k, start)
+            free_slots.insert(k, free_slots[k - 1])
+            free_memory.insert(k, free_memory[k - 1])
+        last = len(times) - 1
+        while True:
+            boundary = times[k + 1] if k < last else end + 1.0
+            if boundary > end:
+                # The task ends inside this segment: split it there
+                times.insert(k + 1, end)
+                free_slots.insert(k + 1, free_slots[k])
+                free_memory.insert(k + 1, free_memory[k])
+            free_slots[k] -= slots
+            free_memory[k] -= memory
+            if boundary >= end:
+                break
+            k += 1
+        if len(times) > 2 * BACKFILL_WINDOW:
+            self.forget()
+        return start
+
+    def forget(self):
+        """Drops all but the last BACKFILL_WINDOW segments; nothing can start before them any more."""
+        del self.times[:-BACKFILL_WINDOW]
+        del self.free_slots[:-BACKFILL_WINDOW]
+        del self.free_memory[:-BACKFILL_WINDOW]
+        # Hints up to the new first breakpoint say nothing more than the cut itself
+        cut = self.times[0]
+        for demand, (durations, starts) in list(self.hints.items()):
+            h = bisect_right(starts, cut)
+            if h == len(starts):
+                del self.hints[demand]
+            else:
+                del durations[:h]
+                del starts[:h]
+
+    def copy(self):
+        return NodeProfile(times=list(self.times), free_slots=list(self.free_slots),
+                           free_memory=list(self.free_memory),
+                           hints={demand: (list(durations), list(starts))
+                                  for demand, (durations, starts) in self.hints.items()})
+
+class BoundaryState:
+    """
+    What previously scheduled work leaves behind for the next batch of tasks:
+    each node's availability (NodeState / NodeProfile, never modified by the
+    models that read it), and where / when already-finished parents produced
+    their outputs. Empty = idle cluster at t=0.
+    """
+    def __init__(self, node_states=None, task_nodes=None, task_finish=None):
+        self.node_states = node_states if node_states else {}  # {node_name: NodeState / NodeProfile}
+        self.task_nodes = task_nodes if task_nodes else {}     # {task_name: node_name}
+        self.task_finish = task_finish if task_finish else {}  # {task_name: finish time}
+
+class SimulationResult:
+    """Per-task timings of a simulated schedule, indexed by topological position."""
+    def __init__(self, start, finish, runtime, compute_energy, transfer_energy, transfer_delay, node_states=None):
+        self.start = start
+        self.finish = finish
+        self.runtime = runtime
+        self.compute_energy = compute_energy
+        self.transfer_energy = transfer_energy
+        self.transfer_delay = transfer_delay
+        self.node_states = node_states
+
+    @property
+    def makespan(self):
+        return max(self.finish)
+
+    @property
+    def total_energy(self):
+        return sum(self.compute_energy) + sum(self.transfer_energy)
+
+class SimulationModel:
+    """
+    Flattened, index-based view of a cluster + workflow shared by all simulators.
+
+    Tasks are stored in topological order and nodes by position, so a schedule is
+    just a list of node indices (one per task) and evaluating it is a single pass
+    over plain lists. Transfer costs live in small group x group tables:
+        delay(edge)  = latency[g_src][g_dst] + size * inv_bandwidth[g_src][g_dst]
+        energy(edge) = size * energy_per_mb[g_src][g_dst]
+    (zero when parent and child share a node), i.e. pure gathers over the edge
+    list that vectorize directly.
+    """
+    def __init__(self, cluster, workflow, boundary=None, allowed_nodes=None):
+        self.cluster = cluster
+        self.workflow = workflow
+        boundary = boundary if boundary else BoundaryState()
+
+        # --- Nodes ---
+        self.node_names = cluster.get_all_nodes()
+        self.node_index = {node: n for n, node in enumerate(self.node_names)}
+        self.node_type = [cluster.get_node_type(node) for node in self.node_names]
+        self.node_power = [cluster.get_power_consumption(node) for node in self.node_names]
+        self.node_speed = [cluster.get_node_speed(node) for node in self.node_names]
+        self.node_capacity = [cluster.get_node_capacity(node) for node in self.node_names]
+        self.node_exclusive = [slots == 1 for slots, _ in self.node_capacity]
+
+        groups = cluster.get_all_groups()
+        group_index = {group: g for g, group in enumerate(groups)}
+        self.node_group = [group_index[cluster.get_node_group(node)] for node in self.node_names]
+        self.group_runtime_dist = [cluster.get_group_runtime_dist(group) for group in groups]
+
+        # --- Links (group x group) ---
+        self.link_latency = []
+        self.link_inv_bandwidth = []
+        self.link_energy_per_mb = []
+        for group_a in groups:
+            latency_row, inv_bw_row, energy_row = [], [], []
+            for group_b in groups:
+                link = cluster.get_group_link(group_a, group_b)
+                latency_row.append(link['latency'])
+                inv_bw_row.append(1.0 / link['bandwidth'])
+                energy_row.append(link['energy_per_mb'])
+            self.link_latency.append(latency_row)
+            self.link_inv_bandwidth.append(inv_bw_row)
+            self.link_energy_per_mb.append(energy_row)
+
+        # --- Tasks (topological order) ---
+        self.tasks = topological_sort(workflow.tasks, completed=boundary.task_finish)
+        self.task_names = [task.name for task in self.tasks]
+        self.task_index = {name: i for i, name in enumerate(self.task_names)}
+
+        self.parents = []      # [(parent_position, size_mb), ...] per task
+        self.external_inputs = []  # [(src_node, finish_time, size_mb), ...] from parents in the boundary
+        self.runtime = []      # runtime on every node, None where the task can't run
+        self.demand = []       # (slots, memory) held on every node, None where the task can't run
+        self.task_power = []   # watts attributed to the task on every node (its share of the slots)
+        self.candidates = []   # valid node indices, in profile then cluster order
+        allowed = set(self.node_index[node] for node in allowed_nodes) if allowed_nodes else None
+        self.preferred_type = []
+        self.runtime_dist = []
+        self.release_time = []
+        for task in self.tasks:
+            self.runtime_dist.append(task.runtime_dist)
+            self.release_time.append(task.release_time)
+            self.parents.append([(self.task_index[dep], task.get_data_size(dep))
+                                 for dep in task.dependencies if dep in self.task_index])
+            self.external_inputs.append([(self.node_index[boundary.task_nodes[dep]], boundary.task_finish[dep],
+                                          task.get_data_size(dep))
+                                         for dep in task.dependencies if dep not in self.task_index])
+
+            runtimes, demands, powers = [], [], []
+            for n, r_type in enumerate(self.node_type):
+                slots, memory = task.get_demand(r_type)
+                node_slots, node_memory = self.node_capacity[n]
+                if r_type in task.duration_profiles and slots <= node_slots and memory <= node_memory:
+                    runtimes.append(task.duration_profiles[r_type] / self.node_speed[n])
+                    demands.append((slots, memory))
+                    powers.append(self.node_power[n] * slots / node_slots)
+                else:
+                    runtimes.append(None)
+                    demands.append(None)
+                    powers.append(None)
+            self.runtime.append(runtimes)
+            self.demand.append(demands)
+            self.task_power.append(powers)
+
+            candidates = []
+            for r_type in task.duration_profiles.keys():
+                candidates.extend(n for n, t in enumerate(self.node_type) if t == r_type and runtimes[n] is not None)
+            if not candidates:
+                raise Exception(f"No valid nodes for task {task.name}")
+            if allowed is not None:
+                candidates = [n for n in candidates if n in allowed]
+                if not candidates:
+                    raise Exception(f"No allowed node can run task {task.name}")
+            self.candidates.append(candidates)
+
+            self.preferred_type.append(min(task.duration_profiles, key=task.duration_profiles.get))
+
+        # Carried states are only ever copied, so they can be shared as they are
+        self.initial_node_states = []
+        for node, exclusive, (slots, memory) in zip(self.node_names, self.node_exclusive, self.node_capacity):
+            carried = boundary.node_states.get(node)
+            if carried is not None:
+                self.initial_node_states.append(carried)
+            elif exclusive:
+                self.initial_node_states.append(NodeState())
+            else:
+                self.initial_node_states.append(NodeProfile(slots, memory))
+
+    def encode(self, schedule):
+        """{task_name: node_name} -> [node_index per topological position]"""
+        return [self.node_index[schedule[name]] for name in self.task_names]
+
+    def decode(self, assignment):
+        """[node_index per topological position] -> {task_name: node_name}"""
+        return {name: self.node_names[n] for name, n in zip(self.task_names, assignment)}
+
+    def new_node_states(self):
+        """Fresh per-node availability trackers, starting from the boundary state."""
+        return [state.copy() for state in self.initial_node_states]
+
+    def transfer(self, src, dst, size_mb):
+        """
+        Delay and energy of moving size_mb from node src to node dst. This is
+        the only place the link cost model is evaluated.
+        """
+        if src == dst or size_mb <= 0:
+            return 0.0, 0.0
+        src_group = self.node_group[src]
+        dst_group = self.node_group[dst]
+        return (self.link_latency[src_group][dst_group] + size_mb * self.link_inv_bandwidth[src_group][dst_group],
+                size_mb * self.link_energy_per_mb[src_group][dst_group])
+
+    def external_ready(self, i, node):
+        """
+        Arrival time and transfer energy of task i's inputs from boundary parents
+        (never earlier than the task's release time).
+        """
+        ready = self.release_time[i]
+        energy = 0.0
+        for src, finish_time, size_mb in self.external_inputs[i]:
+            arrival = finish_time
+            if src != node and size_mb > 0:
+                delay, transfer_energy = self.transfer(src, node, size_mb)
+                arrival += delay
+                energy += transfer_energy
+            if arrival > ready:
+                ready = arrival
+        return ready, energy
+
+    def data_ready(self, i, node, assignment, finish):
+        """
+        Earliest time all inputs of task i are available on node, plus the
+        energy spent moving them there. Parents must already be placed.
+        """
+        ready, energy = self.external_ready(i, node)
+        for p, size_mb in self.parents[i]:
+            arrival = finish[p]
+            src = assignment[p]
+            if src != node and size_mb > 0:
+                delay, transfer_energy = self.transfer(src, node, size_mb)
+                arrival += delay
+                energy += transfer_energy
+            if arrival > ready:
+                ready = arrival
+        return ready, energy
+
+    def simulate(self, assignment):
+        """Runs a full schedule (list of node indices) through the simulator."""
+        num_tasks = len(self.tasks)
+        node_states = self.new_node_states()
+        start = [0.0] * num_tasks
+        finish = [0.0] * num_tasks
+        runtime = [0.0] * num_tasks
+        compute_energy = [0.0] * num_tasks
+        transfer_energy = [0.0] * num_tasks
+        transfer_delay = [0.0] * num_tasks
+
+        for i in range(num_tasks):
+            node = assignment[i]
+            duration = self.runtime[i][node]
+
+            deps_ready, energy = self.data_ready(i, node, assignment, finish)
+            if self.parents[i] or self.external_inputs[i]:
+                parents_done = max([finish[p] for p, _ in self.parents[i]] +
+                                   [finish_time for _, finish_time, _ in self.external_inputs[i]])
+                transfer_delay[i] = deps_ready - parents_done
+
+            slots, memory = self.demand[i][node]
+            start_time = node_states[node].book(deps_ready, duration, slots, memory)
+            finish_time = start_time + duration
+
+            start[i] = start_time
+            finish[i] = finish_time
+            runtime[i] = duration
+            compute_energy[i] = duration * self.task_power[i][node]
+            transfer_energy[i] = energy
+
+        return SimulationResult(start, finish, runtime, compute_energy, transfer_energy, transfer_delay,
+                                node_states)
+
+    def sample_scenarios(self, num_scenarios, rng):
+        """
+        Draws num_scenarios runtime scenarios in one batch. Evaluating every
+        chromosome against the same batch gives common random numbers, so
+        schedules are compared on identical luck.
+        """
+        task_factors = []
+        for dist in self.runtime_dist:
+            if dist:
+                task_factors.append([sample_runtime_factor(rng, dist) for _ in range(num_scenarios)])
+            else:
+                task_factors.append([1.0] * num_scenarios)
+
+        group_factors = []
+        for dist in self.group_runtime_dist:
+            if dist:
+                group_factors.append([sample_runtime_factor(rng, dist) for _ in range(num_scenarios)])
+            else:
+                group_factors.append([1.0] * num_scenarios)
+
+        return RuntimeScenarios(task_factors, group_factors, num_scenarios)
+
+    def simulate_scenarios(self, assignment, scenarios):
+        """
+        Simulates a schedule under every scenario at once. The task loop runs a
+        single time; each step advances all K scenarios as lists, and transfer
+        delays/energy (which don't depend on runtimes) are computed once.
+        Single-slot nodes keep one free time per scenario. A shared node also
+        keeps one profile of every booking's span over all scenarios: a task
+        that fits in it from its earliest ready time to its latest finish
+        can't have waited in any scenario. Only when that fails is the node
+        simulated with one NodeProfile per scenario (replaying what was booked
+        so far), since gaps open up at different times in each.
+        """
+        num_scenarios = scenarios.num_scenarios
+        zeros = [0.0] * num_scenarios
+        node_free_time = []
+        node_hull = []     # bookings' spans over all scenarios, per shared node
+        node_states = []   # one NodeProfile per scenario, once a shared node needed them
+        node_pending = []  # [(starts, finishes, slots, memory)] booked only on the hull so far
+        for n, state in enumerate(self.initial_node_states):
+            if self.node_exclusive[n]:
+                node_free_time.append([state.free_time] * num_scenarios)
+                node_hull.append(None)
+            else:
+                node_free_time.append(None)
+                node_hull.append(state.copy())
+            node_states.append(None)
+            node_pending.append([])
+        finish = [zeros] * len(self.tasks)
+        makespan = zeros
+        energy = zeros
+        wall_sum = zeros
+        transfer_energy = 0.0
+
+        for i in range(len(self.tasks)):
+            node = assignment[i]
+            base = self.runtime[i][node]
+            power = self.task_power[i][node]
+            dst_group = self.node_group[node]
+
+            # Boundary inputs arrive at the same time in every scenario
+            external_ready, external_energy = self.external_ready(i, node)
+            transfer_energy += external_energy
+            ready = [external_ready] * num_scenarios
+            for p, size_mb in self.parents[i]:
+                src = assignment[p]
+                if src != node and size_mb > 0:
+                    delay, edge_energy = self.transfer(src, node, size_mb)
+                    transfer_energy += edge_energy
+                    ready = [r if r > f + delay else f + delay for r, f in zip(ready, finish[p])]
+                else:
+                    ready = [r if r > f else f for r, f in zip(ready, finish[p])]
+
+            durations = [base * tf * gf for tf, gf in
+                         zip(scenarios.task_factors[i], scenarios.group_factors[dst_group])]
+            if self.node_exclusive[node]:
+                task_finish = [(m if m > r else r) + d for m, r, d in zip(node_free_time[node], ready, durations)]
+                node_free_time[node] = task_finish
+            else:
+                slots, memory = self.demand[i][node]
+                hull = node_hull[node]
+                states = node_states[node]
+                task_finish = [r + d for r, d in zip(ready, durations)]
+                first_start = min(ready)
+                last_finish = max(task_finish)
+                fits = hull.find(first_start, last_finish - first_start, slots, memory)[0] == first_start
+                if fits and states is None:
+                    # n bookings add at most 2n breakpoints: no scenario's profile
+                    # may have forgotten history the task would start in
+                    fits = (len(self.initial_node_states[node].times) + 2 * len(node_pending[node]) + 2
+                            <= 2 * BACKFILL_WINDOW)
+                elif fits:
+                    fits = all(r >= state.times[0] for state, r in zip(states, ready))
+
+                if fits and states is None:
+                    node_pending[node].append((ready, task_finish, slots, memory))
+                elif fits:
+                    for state, r, f in zip(states, ready, task_finish):
+                        state.place(r, f, slots, memory)
+                else:
+                    if states is None:
+                        states = node_states[node] = [self.initial_node_states[node].copy()
+                                                      for _ in range(num_scenarios)]
+                        for starts, finishes, booked_slots, booked_memory in node_pending[node]:
+                            for state, task_start, task_end in zip(states, starts, finishes):
+                                state.place(task_start, task_end, booked_slots, booked_memory)
+                        node_pending[node] = None
+                    starts = [state.book(r, d, slots, memory) for state, r, d in zip(states, ready, durations)]
+                    task_finish = [t + d for t, d in zip(starts, durations)]
+                    first_start = min(starts)
+                    last_finish = max(task_finish)
+                hull.place(first_start, last_finish, slots, memory)
+            finish[i] = task_finish
+            makespan = [m if m > f else f for m, f in zip(makespan, task_finish)]
+            energy = [e + d * power for e, d in zip(energy, durations)]
+            wall_sum = [w + f for w, f in zip(wall_sum, task_finish)]
+
+        num_tasks = len(self.tasks)
+        return ScenarioResult(makespan,
+                              [e + transfer_energy for e in energy],
+                              [w / num_tasks for w in wall_sum])
+
+    def boundary_after(self, assignment, result, boundary=None):
+        """
+        Folds a simulated schedule into a BoundaryState for the work that follows.
+        Updates `boundary` in place when given (its task maps can be large).
+        """
+        boundary = boundary if boundary else BoundaryState()
+        for i, node in enumerate(assignment):
+            boundary.task_nodes[self.task_names[i]] = self.node_names[node]
+            boundary.task_finish[self.task_names[i]] = result.finish[i]
+        boundary.node_states = dict(zip(self.node_names, result.node_states))
+        return boundary
+
+    def build_csv_rows(self, assignment, result):
+        """Per-task report rows shared by all schedulers' CSV output."""
+        csv_rows = []
+        for i, task in enumerate(self.tasks):
+            node = assignment[i]
+            node_type = self.node_type[node]
+            preferred_type = self.preferred_type[i]
+            csv_rows.append({
+                'Job ID': task.name,
+                'Assigned Node': self.node_names[node],
+                'Preferred Resource': preferred_type.upper(),
+                'Assigned Resource': node_type.upper(),
+                'Fallback Occurred': "YES" if node_type != preferred_type else "No",
+                'Start Time (s)': result.start[i],
+                'Finish Time (s)': result.finish[i],
+                'Wait Time (s)': result.start[i] - self.release_time[i],
+                'Runtime (s)': result.runtime[i],
+                'Slots': self.demand[i][node][0],
+                'Memory (GB)': self.demand[i][node][1],
+                'Walltime (s)': result.finish[i] - self.release_time[i],
+                'Transfer Delay (s)': result.transfer_delay[i],
+                'Transfer Energy (J)': result.transfer_energy[i],
+                'Energy (J)': result.compute_energy[i] + result.transfer_energy[i],
+                'Dependencies': ";".join(task.dependencies) if task.dependencies else "None"
+            })
+        return csv_rows
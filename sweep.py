@@ -0,0 +1,227 @@
+import argparse
+import contextlib
+import csv
+import io
+import itertools
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from cluster import Cluster
+from jobs import Workflow
+from fcfs import FCFSScheduler
+from genetic_scheduler import GeneticScheduler
+from metrics import compute_metrics
+
+METRICS = ['makespan', 'energy', 'fallbacks', 'avg_wait', 'avg_wall', 'sched_time']
+
+# Two-sided 95% Student-t critical values by degrees of freedom (normal beyond 30).
+T_CRITICAL_95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306,
+    9: 2.262, 10: 2.228, 11: 2.201, 12: 2.179, 13: 2.160, 14: 2.145, 15: 2.131,
+    16: 2.120, 17: 2.110, 18: 2.101, 19: 2.093, 20: 2.086, 21: 2.080, 22: 2.074,
+    23: 2.069, 24: 2.064, 25: 2.060, 26: 2.056, 27: 2.052, 28: 2.048, 29: 2.045, 30: 2.042,
+}
+
+def _result_row(num_tasks, seed, scheduler, mode, pop, gens, csv_rows, sched_time):
+    row = {
+        'tasks': num_tasks,
+        'seed': seed,
+        'scheduler': scheduler,
+        'mode': mode,
+        'pop': pop,
+        'gens': gens,
+    }
+    row.update(compute_metrics(csv_rows))
+    row['sched_time'] = sched_time
+    return row
+
+def build_workflow(num_tasks, seed):
+    """The workflow of a (tasks, seed) cell. Its own RNG makes it identical in every process."""
+    workflow = Workflow()
+    workflow.generate_random_workflow(num_tasks=num_tasks, seed=seed)
+    return workflow
+
+def run_fcfs(num_tasks, seed):
+    """Worker job: the FCFS baseline of one (tasks, seed) cell."""
+    # Scheduler progress output from many workers would just be noise.
+    with contextlib.redirect_stdout(io.StringIO()):
+        fcfs = FCFSScheduler(Cluster(), build_workflow(num_tasks, seed))
+        start = time.perf_counter()
+        schedule, _, _ = fcfs.run()
+        elapsed = time.perf_counter() - start
+        csv_rows = fcfs.evaluate_schedule(schedule)[0]
+    return _result_row(num_tasks, seed, 'fcfs', '', '', '', csv_rows, elapsed)
+
+def run_ga(num_tasks, seed, mode, pop, gens):
+    """
+    Worker job: one GA configuration on one (tasks, seed) cell. The workflow
+    is rebuilt from its seed (cheap next to a GA run), so every configuration
+    can go to its own worker.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        ga = GeneticScheduler(Cluster(), build_workflow(num_tasks, seed), population_size=pop, generations=gens,
+                              mode=mode, seed=seed)
+        start = time.perf_counter()
+        best_schedule = ga.run()
+        elapsed = time.perf_counter() - start
+        csv_rows = ga.evaluate_schedule(best_schedule)[0]
+    return _result_row(num_tasks, seed, 'genetic', mode, pop, gens, csv_rows, elapsed)
+
+def confidence_interval(values):
+    """Returns (mean, half_width) of the 95% confidence interval of the mean."""
+    n = len(values)
+    mean = sum(values) / n
+    if n < 2:
+        return mean, 0.0
+    variance = sum((v - mean) ** 2 for v in values) / (n - 1)
+    t_crit = T_CRITICAL_95.get(n - 1, 1.96)
+    return mean, t_crit * math.sqrt(variance / n)
+
+def aggregate(results):
+    """Groups per-seed results by configuration and adds mean / CI columns per metric."""
+    groups = {}
+    for row in results:
+        key = (row['tasks'], row['scheduler'], row['mode'], row['pop'], row['gens'])
+        groups.setdefault(key, []).append(row)
+
+    summary = []
+    for key in sorted(groups, key=lambda k: (k[0], k[1], str(k[2]), str(k[3]), str(k[4]))):
+        rows = groups[key]
+        entry = {
+            'tasks': key[0],
+            'scheduler': key[1],
+            'mode': key[2],
+            'pop': key[3],
+            'gens': key[4],
+            'runs': len(rows),
+        }
+        for metric in METRICS:
+            mean, half_width = confidence_interval([r[metric] for r in rows])
+            entry[f'{metric}_mean'] = mean
+            entry[f'{metric}_ci95'] = half_width
+        summary.append(entry)
+    return summary
+
+def write_csv(rows, filename):
+    if not rows:
+        return
+    with open(filename, mode='w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=rows[0].keys())
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Written: {filename}")
+
+def print_summary(summary):
+    print("\n--- Sweep Summary (mean ± 95% CI) ---")
+    header = f"{'Tasks':>6} {'Scheduler':<22} {'Runs':>4} {'Makespan (s)':>22} {'Energy (J)':>26} {'Avg Wall (s)':>22}"
+    print(header)
+    print("-" * len(header))
+    for entry in summary:
+        label = _config_label(entry)
+        print(f"{entry['tasks']:>6} {label:<22} {entry['runs']:>4} "
+              f"{entry['makespan_mean']:>12.1f} ± {entry['makespan_ci95']:<7.1f} "
+              f"{entry['energy_mean']:>14.1f} ± {entry['energy_ci95']:<9.1f} "
+              f"{entry['avg_wall_mean']:>12.1f} ± {entry['avg_wall_ci95']:<7.1f}")
+    print("-" * len(header))
+
+def _config_label(entry):
+    if entry['scheduler'] == 'fcfs':
+        return 'FCFS'
+    return f"GA {entry['mode']} p{entry['pop']} g{entry['gens']}"
+
+def plot_summary(summary, output_dir):
+    # Imported lazily so table-only sweeps don't pay for matplotlib.
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    series = {}
+    for entry in summary:
+        series.setdefault(_config_label(entry), []).append(entry)
+
+    plots_to_generate = [
+        ('Makespan vs. Workflow Size', 'makespan', 'Total Duration (s)', 'sweep_makespan.png'),
+        ('Total Energy vs. Workflow Size', 'energy', 'Energy (J)', 'sweep_energy.png'),
+        ('Average Wall Time vs. Workflow Size', 'avg_wall', 'Time (s)', 'sweep_wall_time.png'),
+        ('Scheduling Time vs. Workflow Size', 'sched_time', 'Scheduler Runtime (s)', 'sweep_sched_time.png'),
+    ]
+
+    for title, metric, ylabel, filename in plots_to_generate:
+        plt.figure(figsize=(10, 6))
+        for label, entries in series.items():
+            entries = sorted(entries, key=lambda e: e['tasks'])
+            plt.errorbar([e['tasks'] for e in entries],
+                         [e[f'{metric}_mean'] for e in entries],
+                         yerr=[e[f'{metric}_ci95'] for e in entries],
+                         marker='o', capsize=4, label=label)
+
+        plt.title(title, fontsize=14)
+        plt.xlabel('Tasks', fontsize=12)
+        plt.ylabel(ylabel, fontsize=12)
+        plt.grid(True, linestyle='--', alpha=0.5)
+        plt.legend()
+
+        save_path = os.path.join(output_dir, filename)
+        plt.savefig(save_path)
+        print(f"Saved {title} to: {save_path}")
+        plt.close()
+
+def run_sweep(task_counts, seeds, modes, pops, gens_list, workers=None):
+    """
+    Runs the full grid in a process pool and returns the per-run result rows.
+    Every scheduler run is its own job (FCFS once per (tasks, seed) cell, plus
+    one job per GA configuration), so all workers stay busy even when the grid
+    has fewer cells than workers.
+    """
+    jobs = []
+    for num_tasks, seed in itertools.product(task_counts, seeds):
+        jobs.append((num_tasks, run_fcfs, (num_tasks, seed)))
+        for mode, pop, gens in itertools.product(modes, pops, gens_list):
+            jobs.append((num_tasks * pop * gens, run_ga, (num_tasks, seed, mode, pop, gens)))
+    # Most expensive runs first so the long ones don't straggle at the end.
+    jobs.sort(key=lambda job: -job[0])
+
+    print(f"Running {len(task_counts) * len(seeds)} cells ({len(jobs)} scheduler runs)...")
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run, *args): args for _, run, args in jobs}
+        for done, future in enumerate(as_completed(futures), start=1):
+            row = future.result()
+            results.append(row)
+            print(f"[{done}/{len(jobs)}] tasks={row['tasks']} seed={row['seed']} {_config_label(row)} done")
+
+    results.sort(key=lambda r: (r['tasks'], r['seed'], r['scheduler'], str(r['mode']), str(r['pop']), str(r['gens'])))
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a parallel FCFS vs. GA experiment sweep")
+    parser.add_argument("--tasks", type=int, nargs='+', default=[20, 50, 100], help="Task counts to sweep")
+    parser.add_argument("--seeds", type=int, nargs='+', default=[1, 2, 3, 4, 5], help="Workflow seeds")
+    parser.add_argument("--modes", type=str, nargs='+', default=['balanced'],
+                        choices=['speed', 'energy', 'balanced'], help="GA optimization modes")
+    parser.add_argument("--pop", type=int, nargs='+', default=[100], help="GA population sizes")
+    parser.add_argument("--gens", type=int, nargs='+', default=[100], help="GA generation counts")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all CPUs)")
+    parser.add_argument("--output", type=str, default="sweep_results.csv", help="Per-run results CSV")
+    parser.add_argument("--summary", type=str, default="sweep_summary.csv", help="Aggregated results CSV")
+    parser.add_argument("--plots", type=str, default="sweep_plots", help="Directory for summary plots")
+    parser.add_argument("--no-plots", action="store_true", help="Skip plot generation")
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = run_sweep(args.tasks, args.seeds, args.modes, args.pop, args.gens, workers=args.workers)
+    summary = aggregate(results)
+
+    write_csv(results, args.output)
+    write_csv(summary, args.summary)
+    print_summary(summary)
+
+    if not args.no_plots:
+        plot_summary(summary, args.plots)
+
+    print(f"Sweep finished in {time.perf_counter() - start:.1f} s")
@@ -0,0 +1,172 @@
+import contextlib
+import io
+import random
+from cluster import Cluster
+from jobs import Task, Workflow
+from simulation import SimulationModel, NodeProfile, BoundaryState, BACKFILL_WINDOW
+
+def random_workflow(num_tasks, seed):
+    workflow = Workflow()
+    with contextlib.redirect_stdout(io.StringIO()):
+        workflow.generate_random_workflow(num_tasks=num_tasks, seed=seed)
+    return workflow
+
+def brute_force_start(bookings, capacity, ready, duration, slots, memory):
+    """First-fit start by checking every candidate against every booking."""
+    node_slots, node_memory = capacity
+
+    def fits(t):
+        # Usage only changes at booking starts, so checking those inside the window is enough
+        points = [t] + [s for s, _, _, _ in bookings if t < s < t + duration]
+        for p in points:
+            used_slots = sum(b_slots for s, e, b_slots, _ in bookings if s <= p < e)
+            used_memory = sum(b_memory for s, e, _, b_memory in bookings if s <= p < e)
+            if used_slots + slots > node_slots or used_memory + memory > node_memory:
+                return False
+        return True
+
+    for t in sorted({ready} | {e for _, e, _, _ in bookings if e > ready}):
+        if fits(t):
+            return t
+    raise AssertionError("the empty tail of the profile always fits")
+
+def test_profile_matches_brute_force_first_fit():
+    for seed in range(200):
+        rng = random.Random(seed)
+        capacity = (rng.choice([2, 4, 8]), rng.choice([16, 64]))
+        profile = NodeProfile(*capacity)
+        bookings = []
+        for _ in range(rng.randint(1, 40)):
+            ready = rng.choice([0.0, rng.uniform(0, 200), float(rng.randint(0, 20) * 10)])
+            duration = float(rng.randint(1, 8) * 10)
+            slots = rng.randint(1, capacity[0])
+            memory = rng.randint(0, capacity[1])
+            expected = brute_force_start(bookings, capacity, ready, duration, slots, memory)
+            if rng.random() < 0.5:
+                start = profile.book(ready, duration, slots, memory)
+            else:
+                start = profile.earliest_start(ready, duration, slots, memory)
+                profile.place(start, start + duration, slots, memory)
+            assert start == expected, (seed, len(bookings))
+            bookings.append((start, start + duration, slots, memory))
+
+def check_capacity(model, assignment, result):
+    """No node ever runs more than its slots / memory at once."""
+    for n, (node_slots, node_memory) in enumerate(model.node_capacity):
+        placed = [(result.start[i], result.finish[i], *model.demand[i][n])
+                  for i in range(len(model.tasks)) if assignment[i] == n and result.finish[i] > result.start[i]]
+        for start, _, _, _ in placed:
+            used_slots = sum(b[2] for b in placed if b[0] <= start < b[1])
+            used_memory = sum(b[3] for b in placed if b[0] <= start < b[1])
+            assert used_slots <= node_slots and used_memory <= node_memory, model.node_names[n]
+
+def chunked_finish(cluster, workflow, schedule, chunk_size):
+    """Simulates a schedule chunk by chunk, carrying the state like HierarchicalScheduler."""
+    tasks = SimulationModel(cluster, workflow).tasks
+    state = BoundaryState()
+    for k in range(0, len(tasks), chunk_size):
+        chunk = Workflow()
+        chunk.tasks = tasks[k:k + chunk_size]
+        model = SimulationModel(cluster, chunk, BoundaryState(dict(state.node_states), state.task_nodes,
+                                                               state.task_finish))
+        assignment = model.encode(schedule)
+        model.boundary_after(assignment, model.simulate(assignment), state)
+    return state.task_finish
+
+def test_chunked_simulation_matches_global():
+    cluster = Cluster()
+    for seed in range(100):
+        workflow = random_workflow(60, seed)
+        model = SimulationModel(cluster, workflow)
+        rng = random.Random(seed)
+        assignment = [rng.choice(candidates) for candidates in model.candidates]
+        result = model.simulate(assignment)
+        check_capacity(model, assignment, result)
+        expected = dict(zip(model.task_names, result.finish))
+        for chunk_size in (1, 2, 3, 7):
+            assert chunked_finish(cluster, workflow, model.decode(assignment), chunk_size) == expected, \
+                (seed, chunk_size)
+
+def test_late_root_waits_behind_carried_bookings():
+    # A and A2 fill cpu_fast_1 up to t=250 and C / D hold two slots until
+    # t=300. E is ready at t=0 but only arrives in a later chunk, and must
+    # still queue behind all of them
+    cluster = Cluster()
+    full = {'cpu': {'slots': 32, 'memory': 0}}
+    workflow = Workflow()
+    workflow.tasks = [
+        Task("A", {'cpu': 100}, demands=full),
+        Task("A2", {'cpu': 400}, ["A"], demands=full),
+        Task("C", {'cpu': 100}, ["A2"]),
+        Task("D", {'cpu': 100}, ["A2"]),
+        Task("E", {'cpu': 100}, demands=full),
+    ]
+    schedule = {task.name: 'cpu_fast_1' for task in workflow.tasks}
+    model = SimulationModel(cluster, workflow)
+    expected = dict(zip(model.task_names, model.simulate(model.encode(schedule)).finish))
+    assert expected["E"] == 350.0
+    for chunk_size in (1, 2, 3):
+        assert chunked_finish(cluster, workflow, schedule, chunk_size) == expected, chunk_size
+
+def test_chunked_simulation_matches_global_after_forgetting():
+    # Everything on its first candidate piles well over BACKFILL_WINDOW
+    # bookings onto cpu_fast_1 / gpu_a100_1, so old history gets dropped
+    cluster = Cluster()
+    workflow = random_workflow(1500, 3)
+    model = SimulationModel(cluster, workflow)
+    assignment = [candidates[0] for candidates in model.candidates]
+    result = model.simulate(assignment)
+    check_capacity(model, assignment, result)
+    assert max(len(state.times) for state in result.node_states if isinstance(state, NodeProfile)) \
+        <= 2 * BACKFILL_WINDOW
+    expected = dict(zip(model.task_names, result.finish))
+    for chunk_size in (37, 500):
+        assert chunked_finish(cluster, workflow, model.decode(assignment), chunk_size) == expected, chunk_size
+
+def scenario_runtimes(model, base, scenarios, k):
+    """The runtime table `base` as it is in scenario k."""
+    return [[None if runtime is None else
+             runtime * scenarios.task_factors[i][k] * scenarios.group_factors[model.node_group[n]][k]
+             for n, runtime in enumerate(runtimes)]
+            for i, runtimes in enumerate(base)]
+
+def check_scenarios(model, assignment, num_scenarios, seed):
+    scenarios = model.sample_scenarios(num_scenarios, random.Random(seed))
+    outcome = model.simulate_scenarios(assignment, scenarios)
+    base = model.runtime
+    try:
+        for k in range(num_scenarios):
+            model.runtime = scenario_runtimes(model, base, scenarios, k)
+            result = model.simulate(assignment)
+            assert abs(result.makespan - outcome.makespan[k]) < 1e-6, (seed, k)
+            assert abs(result.total_energy - outcome.energy[k]) < 1e-3, (seed, k)
+            assert abs(sum(result.finish) / len(result.finish) - outcome.avg_wall[k]) < 1e-6, (seed, k)
+    finally:
+        model.runtime = base
+
+def test_scenarios_match_per_scenario_simulation():
+    cluster = Cluster()
+    for seed in range(30):
+        rng = random.Random(seed)
+        workflow = random_workflow(rng.choice([20, 60, 150]), seed)
+        model = SimulationModel(cluster, workflow)
+        if seed % 3 == 0:
+            # Second half on top of the state the first half leaves behind
+            half = len(model.tasks) // 2
+            first, second = Workflow(), Workflow()
+            first.tasks, second.tasks = model.tasks[:half], model.tasks[half:]
+            first_model = SimulationModel(cluster, first)
+            first_assignment = [rng.choice(candidates) for candidates in first_model.candidates]
+            boundary = first_model.boundary_after(first_assignment, first_model.simulate(first_assignment))
+            model = SimulationModel(cluster, second, boundary)
+        # Mostly the first candidate, so the shared nodes get busy
+        assignment = [candidates[0] if rng.random() < 0.6 else rng.choice(candidates)
+                      for candidates in model.candidates]
+        check_scenarios(model, assignment, 8, seed)
+
+def test_scenarios_match_per_scenario_simulation_after_forgetting():
+    cluster = Cluster()
+    model = SimulationModel(cluster, random_workflow(1200, 3))
+    rng = random.Random(1)
+    assignment = [candidates[0] if rng.random() < 0.8 else rng.choice(candidates) for candidates in model.candidates]
+    check_scenarios(model, assignment, 4, 2)